@@ -0,0 +1,104 @@
+from typing import Dict, Iterable, List, Tuple
+
+# Deduplicated action verbs, grouped by the field they are most associated with
+ACTION_VERBS = (
+    # Leadership & Management
+    'managed', 'led', 'increased', 'reduced', 'achieved', 'developed', 'supervised',
+    'directed', 'coordinated', 'oversaw', 'spearheaded', 'delegated', 'organised',
+    'executed', 'administered', 'facilitated', 'guided', 'chaired', 'orchestrated',
+    'motivated', 'empowered', 'influenced', 'transformed', 'streamlined',
+
+    # Problem-Solving & Analytical
+    'resolved', 'diagnosed', 'investigated', 'evaluated', 'assessed', 'identified',
+    'interpreted', 'synthesised', 'formulated', 'conceptualised', 'devised', 'designed',
+    'troubleshot', 'improved', 'optimised', 'innovated', 'calculated', 'forecasted',
+    'critiqued',
+
+    # Communication & Interpersonal
+    'presented', 'negotiated', 'persuaded', 'advised', 'consulted', 'counseled',
+    'communicated', 'trained', 'educated', 'instructed', 'explained', 'mediated',
+    'promoted', 'drafted', 'wrote', 'edited', 'proofread', 'published', 'corresponded',
+
+    # Technical & IT
+    'programmed', 'engineered', 'implemented', 'built', 'debugged', 'tested',
+    'automated', 'integrated', 'configured', 'maintained', 'updated', 'secured',
+    'installed', 'networked', 'deployed', 'customised', 'coded',
+
+    # Sales & Marketing
+    'sold', 'marketed', 'advertised', 'pitched', 'closed', 'converted', 'generated',
+    'captured', 'expanded', 'maximised', 'upsold', 'strategized', 'launched', 'branded',
+    'targeted',
+
+    # Finance & Accounting
+    'audited', 'budgeted', 'analyzed', 'allocated', 'balanced', 'estimated',
+    'reconciled', 'reported', 'controlled', 'projected', 'processed', 'invested',
+    'costed',
+
+    # Customer Service & Client Relations
+    'assisted', 'supported', 'served', 'responded', 'addressed', 'handled', 'engaged',
+    'retained', 'followed-up', 'welcomed', 'listened', 'recommended', 'satisfied',
+    'advocated', 'collaborated',
+
+    # Teaching & Training
+    'taught', 'coached', 'mentored', 'demonstrated', 'conducted', 'adapted',
+    'encouraged', 'inspired', 'illustrated', 'moderated',
+
+    # Creative & Design
+    'created', 'photographed', 'sketched', 'produced', 'styled', 'crafted', 'painted',
+    'filmed', 'animated', 'composed', 'curated', 'visualized',
+
+    # Medical & Healthcare
+    'treated', 'examined', 'prescribed', 'monitored', 'rehabilitated', 'operated',
+    'recorded', 'intervened', 'researched',
+
+    # Research & Development
+    'analysed', 'experimented', 'documented', 'validated', 'discovered', 'compiled',
+    'compared',
+
+    # Operations & Logistics
+    'scheduled', 'arranged', 'dispatched', 'standardized', 'delivered', 'transported',
+
+    # Legal & Compliance
+    'reviewed', 'litigated', 'argued', 'complied', 'defended', 'filed', 'enforced',
+    'arbitrated',
+
+    # Engineering & Manufacturing
+    'manufactured', 'fabricated', 'constructed', 'assembled', 'modeled', 'upgraded',
+
+    # Human Resources
+    'recruited', 'interviewed', 'hired',
+
+    # Environmental & Sustainability
+    'conserved', 'restored', 'protected', 'certified', 'measured', 'enhanced',
+)
+
+
+class VerbMatcher:
+    """Whole-word action verb lookup over a stream of lowercase tokens"""
+
+    def __init__(self, verbs=ACTION_VERBS):
+        self.verbs = frozenset(verb.lower() for verb in verbs)
+
+    def match_tokens(self, tokens: Iterable[Tuple[str, int, int]]) -> Dict[str, List[int]]:
+        """Returns {verb: [character offsets]} in order of first appearance.
+
+        Tokens are whole words (see analysis_context.TOKEN_PATTERN), so 'led'
+        does not match inside 'handled'.
+        """
+        hits = {}
+        verbs = self.verbs
+        for word, start, _ in tokens:
+            if word in verbs:
+                hits.setdefault(word, []).append(start)
+        return hits
+
+
+_matcher = None
+
+
+def get_verb_matcher() -> VerbMatcher:
+    """Process-wide matcher, built on first use"""
+    global _matcher
+    if _matcher is None:
+        _matcher = VerbMatcher()
+    return _matcher
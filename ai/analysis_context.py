@@ -0,0 +1,87 @@
+import re
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple
+
+from section_detector import SectionDetector
+
+# Lowercase words and numbers, keeping inner hyphens ('followed-up', 'co-op');
+# action verbs are matched against these tokens, one segment at a time
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+# A sentence ends at terminal punctuation followed by whitespace, or at a line break
+SENTENCE_BREAK_PATTERN = re.compile(r"[.!?]+(?=\s)|\n+")
+
+# Segment name for the text before the first section header (name, contact line)
+PREAMBLE = 'preamble'
+
+
+class AnalysisContext:
+    """Views of one cleaned resume, computed once and shared by every stage.
+
+    `headers`, `section_flags` and `section_bounds` come from a single scan
+    by the section detector; segments and sentences are built on first use.
+    """
+
+    def __init__(self, text: str, section_detector: SectionDetector):
+        self.text = text
+        self.lower = text.lower()
+
+        scan = section_detector.scan(self.lower)
+        # [(section_name, header_start, header_end)]
+        self.headers: List[Tuple[str, int, int]] = scan.headers
+        # {section_name: (start, end)} of the first keyword hit, for sections found without a header
+        self.keyword_spans: Dict[str, Tuple[int, int]] = scan.keyword_spans
+        # {section_name: present} for every scored section
+        self.section_flags: Dict[str, bool] = scan.flags
+
+        # Filled in by ResumeAnalyzer._section_features
+        self.features: Optional[Dict] = None
+        self.changed_sections: List[str] = []
+
+    @cached_property
+    def section_bounds(self) -> Dict[str, Tuple[int, int]]:
+        """{section_name: (start_index, end_index)} of each section body"""
+        bounds = {}
+        for i, (section, _, header_end) in enumerate(self.headers):
+            end = self.headers[i + 1][1] if i + 1 < len(self.headers) else len(self.text)
+            bounds[section] = (header_end, self._body_end(header_end, end))
+        return bounds
+
+    @cached_property
+    def segments(self) -> List[Tuple[str, int, int, int]]:
+        """[(section_name, start, body_start, end)] of the text in order.
+
+        PREAMBLE runs up to the first header; every other segment runs from
+        its header to the next one, so a segment's body is its section_bounds
+        span unless the section appears twice. Segments end before trailing
+        whitespace, so a section hashes the same whether or not another
+        section follows it.
+        """
+        first_header = self.headers[0][1] if self.headers else len(self.text)
+        segments = [(PREAMBLE, 0, 0, self._body_end(0, first_header))] if first_header else []
+        for i, (section, header_start, header_end) in enumerate(self.headers):
+            end = self.headers[i + 1][1] if i + 1 < len(self.headers) else len(self.text)
+            segments.append((section, header_start, header_end, self._body_end(header_end, end)))
+        return segments
+
+    def _body_end(self, body_start: int, end: int) -> int:
+        """end moved back over the whitespace that separates a body from the next header"""
+        return body_start + len(self.text[body_start:end].rstrip())
+
+    @cached_property
+    def sentences(self) -> List[Tuple[int, int]]:
+        """[(start, end)] of each non-empty sentence"""
+        spans = []
+        start = 0
+        for match in SENTENCE_BREAK_PATTERN.finditer(self.text):
+            if self.text[start:match.start()].strip():
+                spans.append((start, match.start()))
+            start = match.end()
+        if self.text[start:].strip():
+            spans.append((start, len(self.text)))
+        return spans
+
+    def section_text(self, section: str) -> str:
+        """Body text of a section, or '' when the section has no header"""
+        start, end = self.section_bounds.get(section, (0, 0))
+        return self.text[start:end]
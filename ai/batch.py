@@ -0,0 +1,144 @@
+import os
+import sys
+import json
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ALL_COMPLETED, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterator, Set, Tuple
+
+# Set in each pool process by _init_worker
+_analyzer = None
+
+
+def _init_worker(analyzer_factory: Callable, with_opinion: bool):
+    global _analyzer
+    # Re-scoring must not be served from (or flood) the result cache,
+    # nor count the same titles towards promotion again
+    _analyzer = analyzer_factory(ai_opinion=with_opinion, cache=False, learn_titles=False)
+
+
+def _analyze(item_id: str, resume_text: str, job_title: str) -> Tuple[str, Dict]:
+    return item_id, _analyzer.analyze_resume(resume_text, job_title)
+
+
+def iter_directory(path: str, job_title: str) -> Iterator[Tuple[str, str, str]]:
+    """Yields (id, resume_text, job_title) for every .txt file in a directory"""
+    for name in sorted(os.listdir(path)):
+        if not name.endswith('.txt'):
+            continue
+        with open(os.path.join(path, name), encoding='utf-8', errors='ignore') as f:
+            yield name, f.read(), job_title
+
+
+def iter_jsonl(path: str, job_title: str = None) -> Iterator[Tuple[str, str, str]]:
+    """Yields (id, resume_text, job_title) for every line of a JSONL file.
+
+    Lines without an "id" are identified by their line number.
+    """
+    with open(path, encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                print(f"Skipping malformed line {line_no}", file=sys.stderr)
+                continue
+            yield (
+                str(record.get('id', line_no)),
+                record.get('resume_text', ''),
+                record.get('job_title') or job_title
+            )
+
+
+def load_checkpoint(output_path: str) -> Set[str]:
+    """Returns ids already written to the output file.
+
+    A trailing partial line left by an interrupted run is truncated so the
+    item is simply analysed again.
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+
+    with open(output_path, 'rb+') as f:
+        data = f.read()
+        end = data.rfind(b'\n') + 1
+        if end < len(data):
+            f.truncate(end)
+
+    for line in data[:end].splitlines():
+        try:
+            done.add(str(json.loads(line)['id']))
+        except (ValueError, KeyError):
+            continue
+    return done
+
+
+def run_batch(analyzer_factory: Callable, items: Iterator[Tuple[str, str, str]], output_path: str,
+              workers: int = None, with_opinion: bool = False, restart: bool = False) -> int:
+    """Analyses items over a process pool, appending JSONL results as they finish"""
+    workers = workers or os.cpu_count() or 1
+    # Bound the number of resume texts held in memory at once
+    max_in_flight = workers * 4
+
+    if restart and os.path.exists(output_path):
+        os.unlink(output_path)
+    done = load_checkpoint(output_path)
+    if done:
+        print(f"Resuming: {len(done)} results already in {output_path}", file=sys.stderr)
+
+    written = 0
+    pending = set()
+
+    with open(output_path, 'a', encoding='utf-8') as out, ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('fork'),
+        initializer=_init_worker,
+        initargs=(analyzer_factory, with_opinion)
+    ) as pool:
+
+        def _drain(return_when):
+            nonlocal pending, written
+            finished, pending = wait(pending, return_when=return_when)
+            for future in finished:
+                item_id, result = future.result()
+                out.write(json.dumps({'id': item_id, 'result': result}) + "\n")
+                written += 1
+            out.flush()
+
+        for item_id, resume_text, job_title in items:
+            if item_id in done:
+                continue
+            if len(pending) >= max_in_flight:
+                _drain(FIRST_COMPLETED)
+            pending.add(pool.submit(_analyze, item_id, resume_text, job_title))
+
+        if pending:
+            _drain(ALL_COMPLETED)
+
+    return written
+
+
+def run(analyzer_factory: Callable, argv):
+    """Entry point for `resume_analyser.py --batch INPUT [options]`"""
+    parser = argparse.ArgumentParser(prog='resume_analyser.py --batch')
+    parser.add_argument('input', help='Directory of .txt resumes or a JSONL file of {id, resume_text, job_title}')
+    parser.add_argument('-o', '--output', required=True, help='JSONL file results are appended to')
+    parser.add_argument('--job-title', help='Job title for directory input or JSONL lines without one')
+    parser.add_argument('--workers', type=int, help='Pool size (default: number of cores)')
+    parser.add_argument('--with-opinion', action='store_true', help='Also request the LLM opinion (slow)')
+    parser.add_argument('--restart', action='store_true', help='Ignore existing results and start over')
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.input):
+        if not args.job_title:
+            parser.error('--job-title is required for directory input')
+        items = iter_directory(args.input, args.job_title)
+    else:
+        items = iter_jsonl(args.input, args.job_title)
+
+    written = run_batch(analyzer_factory, items, args.output, args.workers,
+                        args.with_opinion, args.restart)
+    print(f"Wrote {written} results to {args.output}", file=sys.stderr)
@@ -0,0 +1,186 @@
+"""Stage-level benchmark for ResumeAnalyzer on a synthetic corpus.
+
+Times _clean_text, _detect_sections, _find_metrics, _check_quality,
+_section_features (every per-section feature, with no cache),
+_calculate_title_match and the full analyze_resume on seeded resumes of 1-50
+pages and on adversarial inputs. The LLM, the caches and the database are
+stubbed out; the title index is a fixed in-memory list.
+analyze_resume_edited re-analyses the resume with one line appended to its
+last section, with a section feature cache in a temporary directory.
+
+    python ai/benchmarks/analyser.py --save ai/benchmarks/baselines/local.json
+    python ai/benchmarks/analyser.py --compare ai/benchmarks/baselines/local.json [--tolerance 0.25]
+
+--compare exits 1 when any stage is slower than the baseline by more than
+the tolerance (and by more than --min-delta-ms, to ignore timer noise).
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+from typing import Callable, Dict
+
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AI_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import corpus, known_titles
+
+
+class NullDatabase:
+    """Database stand-in: no rows, every write accepted"""
+
+    def query(self, name, params=()):
+        return []
+
+    def execute(self, name, params=()):
+        return True
+
+    def executemany(self, name, rows):
+        return True
+
+
+def make_analyzer():
+    from resume_analyser import ResumeAnalyzer
+    from title_index import TitleIndex
+
+    analyzer = ResumeAnalyzer(ai_opinion=False, cache=False, learn_titles=False)
+    analyzer.db = NullDatabase()
+    index = TitleIndex()
+    for title in known_titles():
+        index.add(title, title)
+    analyzer._title_index = index
+    analyzer.title_index_loaded = True
+    return analyzer
+
+
+def time_ms(func: Callable, repeat: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {'median_ms': round(statistics.median(samples), 3), 'min_ms': round(min(samples), 3)}
+
+
+def per_segment(analyzer, method: Callable, clean: str) -> list:
+    """One feature over every segment of a fresh context, as _section_features computes it"""
+    context = analyzer._build_context(clean)
+    return [method(context, *segment[1:]) for segment in context.segments]
+
+
+def bench_case(analyzer, incremental, text: str, job_title: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    clean = analyzer._clean_text(text)
+    title = analyzer._standardize_title(job_title)
+    # Each stage gets a fresh context so lazily computed fields are not shared
+    fresh = lambda: analyzer._build_context(clean)
+    built = fresh()
+    # Every edit is new, so only the last section misses the feature cache
+    incremental.analyze_resume(text, job_title)
+    edits = iter(range(repeat))
+    edited = lambda: incremental.analyze_resume(f"{text}\nReduced costs by {next(edits) + 10}%", job_title)
+
+    return {
+        '_clean_text': time_ms(lambda: analyzer._clean_text(text), repeat),
+        '_build_context': time_ms(fresh, repeat),
+        # The section scan itself runs in _build_context; this times what is left
+        '_detect_sections': time_ms(lambda: analyzer._detect_sections(built), repeat),
+        '_find_metrics': time_ms(
+            lambda: per_segment(analyzer, lambda c, start, _, end: analyzer._segment_metrics(c, start, end), clean),
+            repeat),
+        '_check_quality': time_ms(lambda: per_segment(analyzer, analyzer._segment_quality, clean), repeat),
+        '_section_features': time_ms(lambda: analyzer._section_features(fresh()), repeat),
+        '_calculate_title_match': time_ms(lambda: analyzer._calculate_title_match(fresh(), title), repeat),
+        'analyze_resume': time_ms(lambda: analyzer.analyze_resume(text, job_title), repeat),
+        'analyze_resume_edited': time_ms(edited, repeat),
+    }
+
+
+def run(seed: int, repeat: int, only: str = None) -> Dict:
+    from result_cache import ResultCache
+
+    analyzer = make_analyzer()
+    # Warm up lazy imports and the title vectoriser outside the timings
+    analyzer.analyze_resume("EXPERIENCE\nLed a team of 5 engineers.", "Software Engineer")
+
+    cache_dir = tempfile.TemporaryDirectory()
+    incremental = make_analyzer()
+    incremental.section_cache = ResultCache('section_features', path=os.path.join(cache_dir.name, 'cache.sqlite'))
+
+    results = {}
+    for name, (text, job_title) in corpus(seed).items():
+        if only and only not in name:
+            continue
+        results[name] = bench_case(analyzer, incremental, text, job_title, repeat)
+        total = results[name]['analyze_resume']['median_ms']
+        print(f"{name:<22} {len(text):>9,} chars  analyze_resume {total:>10.2f} ms", file=sys.stderr)
+    cache_dir.cleanup()
+
+    return {
+        'meta': {
+            'seed': seed,
+            'repeat': repeat,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float, min_delta_ms: float) -> int:
+    """Prints a per-stage comparison and returns the number of regressions"""
+    regressions = 0
+    print(f"{'case':<22} {'stage':<24} {'baseline':>10} {'current':>10} {'change':>8}")
+    for case, stages in current['results'].items():
+        for stage, timing in stages.items():
+            before = baseline['results'].get(case, {}).get(stage)
+            if not before:
+                continue
+            old, new = before['median_ms'], timing['median_ms']
+            change = (new - old) / old if old else 0.0
+            regressed = change > tolerance and new - old > min_delta_ms
+            regressions += regressed
+            flag = '  REGRESSION' if regressed else ''
+            print(f"{case:<22} {stage:<24} {old:>10.2f} {new:>10.2f} {change:>+7.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ResumeAnalyzer stage benchmark")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per stage; the median is reported')
+    parser.add_argument('--only', help='Run only cases whose name contains this')
+    parser.add_argument('--save', help='Write the results as a JSON baseline')
+    parser.add_argument('--compare', help='Baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown (0.25 = 25%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=0.5)
+    args = parser.parse_args()
+
+    current = run(args.seed, args.repeat, args.only)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+        print(f"Saved baseline to {args.save}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline['meta'].get('seed') != args.seed:
+            print("Baseline was recorded with a different seed", file=sys.stderr)
+        regressions = compare(current, baseline, args.tolerance, args.min_delta_ms)
+        print(f"\n{regressions} regression(s)")
+        sys.exit(1 if regressions else 0)
+
+    if not args.save:
+        print(json.dumps(current, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Text cleaner benchmark on OCR-like input.
+
+Times the previous multi-pass cleaner (ASCII round trip, split/join, then one
+re.sub per artefact) against text_cleaner.clean_text on seeded resumes of
+1-100 pages with OCR noise added, and reports how many lines survive (the old
+cleaner always returned a single line).
+
+    python ai/benchmarks/clean_text.py [--pages 1 10 100] [--repeat 5]
+"""
+import os
+import re
+import sys
+import time
+import argparse
+import statistics
+
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AI_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import generate_resume, ocr_noise
+from text_cleaner import clean_text
+
+
+def legacy_clean_text(text: str) -> str:
+    """ResumeAnalyzer._clean_text before the single-pass cleaner"""
+    text = text.encode('ascii', errors='ignore').decode('ascii')
+    text = ' '.join(text.split())
+    text = re.sub(r'•|•|◦|▪', ' ', text)
+    text = re.sub(r'\bpage\s*\d+\b', '', text, flags=re.I)
+    text = re.sub(r'http[s]?://\S+', '', text)
+    text = re.sub(r'\n\s*([A-Z][A-Z\s]+)\s*\n', r'\n\1\n', text)
+    return text.strip()
+
+
+def median_ms(func, text: str, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(text)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Text cleaner benchmark")
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'pages':>5} {'chars':>10} {'legacy':>10} {'clean_text':>11} {'speedup':>8} {'lines kept':>11}")
+    for pages in args.pages:
+        text = ocr_noise(generate_resume(args.seed + pages, pages), args.seed)
+        legacy = median_ms(legacy_clean_text, text, args.repeat)
+        current = median_ms(clean_text, text, args.repeat)
+        lines = clean_text(text).count('\n') + 1
+        print(f"{pages:>5} {len(text):>10,} {legacy:>8.2f}ms {current:>9.2f}ms "
+              f"{legacy / current:>7.1f}x {lines:>11,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Seeded synthetic resumes for the analyser benchmarks.
+
+`generate_resume(seed, pages)` returns the same text for the same arguments on
+every machine, so timings from different runs are comparable.
+"""
+import random
+from typing import Dict, List, Tuple
+
+LINES_PER_PAGE = 45
+
+HEADERS = {
+    'contact': ['CONTACT', 'Contact', 'Contact Information', 'Personal Details'],
+    'summary': ['SUMMARY', 'Summary:', 'Professional Summary', 'Profile', 'About Me'],
+    'experience': ['EXPERIENCE', 'Experience', 'Work Experience', 'Employment History', 'Professional Experience'],
+    'education': ['EDUCATION', 'Education', 'Academic Background', 'Qualifications'],
+    'skills': ['SKILLS', 'Skills:', 'Technical Skills', 'Core Competencies'],
+    'projects': ['PROJECTS', 'Projects', 'Selected Projects', 'Key Projects'],
+}
+
+VERBS = ['Led', 'Managed', 'Developed', 'Designed', 'Implemented', 'Improved', 'Reduced', 'Increased',
+         'Built', 'Delivered', 'Automated', 'Streamlined', 'Launched', 'Negotiated', 'Mentored']
+FILLER = ['Responsible for', 'Worked on', 'Helped with', 'Involved in', 'Participated in']
+OBJECTS = ['the payments platform', 'a data pipeline', 'customer onboarding', 'the reporting suite',
+           'an internal API', 'the mobile app', 'supplier contracts', 'a cross-functional team',
+           'the CI/CD process', 'quarterly planning']
+METRICS = ['by {n}%', 'saving ${n},000 a year', '{n}x faster', 'for {n}+ clients', 'across {n} regions',
+           'cutting latency from {n}ms to {m}ms', 'within {n} weeks', 'to {n} million users']
+MONTHS = ['Jan', 'Feb', 'Mar', 'April', 'May', 'June', 'July', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+SKILLS = ['Python', 'SQL', 'AWS', 'Docker', 'Kubernetes', 'React', 'Excel', 'Tableau', 'Java',
+          'Stakeholder management', 'Agile', 'Terraform', 'Go', 'Figma', 'Salesforce']
+GENERIC = ['Team player with a hard worker attitude.', 'I am detail oriented and my goal is growth.',
+           'The system was maintained by the team.']
+
+JOB_TITLES = ['Software Engineer', 'Data Scientist', 'Product Manager', 'Project Manager',
+              'Marketing Manager', 'Financial Analyst', 'UX Designer', 'DevOps Engineer']
+
+
+def _date_range(rng: random.Random) -> str:
+    start = rng.randint(2005, 2022)
+    end = 'Present' if rng.random() < 0.2 else f"{rng.choice(MONTHS)} {rng.randint(start, 2024)}"
+    dash = rng.choice(['-', ' - ', ' – ', '—'])
+    return f"{rng.choice(MONTHS)} {start}{dash}{end}"
+
+
+def _bullet(rng: random.Random, verb_density: float, metric_density: float) -> str:
+    lead = rng.choice(VERBS) if rng.random() < verb_density else rng.choice(FILLER)
+    line = f"{rng.choice(['•', '-', '*', ''])} {lead} {rng.choice(OBJECTS)}"
+    if rng.random() < metric_density:
+        line += ' ' + rng.choice(METRICS).format(n=rng.randint(2, 95), m=rng.randint(1, 9))
+    if rng.random() < 0.05:
+        line += ' ' + rng.choice(GENERIC)
+    return line.strip() + '.'
+
+
+def generate_resume(seed: int, pages: int = 1, verb_density: float = 0.7,
+                    metric_density: float = 0.4) -> str:
+    """A resume of roughly `pages` pages with varied headers, dates, metrics and verbs"""
+    rng = random.Random(seed)
+    lines: List[str] = [
+        f"Candidate {seed}",
+        rng.choice(HEADERS['contact']),
+        f"candidate{seed}@example.com | +44 7700 900{seed % 1000:03d} | https://example.com/cv/{seed}",
+        rng.choice(HEADERS['summary']),
+        f"{rng.choice(JOB_TITLES)} with {rng.randint(2, 20)} years of experience delivering "
+        f"{rng.choice(OBJECTS)} and {rng.choice(OBJECTS)}.",
+        rng.choice(HEADERS['experience']),
+    ]
+
+    target = pages * LINES_PER_PAGE - 12
+    page = 1
+    while len(lines) < target:
+        lines.append(f"{rng.choice(JOB_TITLES)}, Company {rng.randint(1, 500)}  {_date_range(rng)}")
+        for _ in range(rng.randint(3, 8)):
+            lines.append(_bullet(rng, verb_density, metric_density))
+        if len(lines) >= page * LINES_PER_PAGE:
+            page += 1
+            lines.append(f"Page {page}")
+
+    lines.append(rng.choice(HEADERS['projects']))
+    lines.extend(_bullet(rng, verb_density, metric_density) for _ in range(3))
+    lines.append(rng.choice(HEADERS['education']))
+    lines.append(f"BSc Computer Science, University {rng.randint(1, 90)}  {_date_range(rng)}")
+    lines.append(rng.choice(HEADERS['skills']))
+    lines.append(', '.join(rng.sample(SKILLS, 8)))
+    return '\n'.join(lines)
+
+
+def ocr_noise(text: str, seed: int = 0) -> str:
+    """The artefacts OCR and PDF text layers add: ligatures, typographic
+    dashes and quotes, non-breaking spaces, stray bullets and ragged spacing"""
+    rng = random.Random(seed)
+    swaps = [('fi', '\ufb01'), ('fl', '\ufb02'), ('ff', '\ufb00'), (' - ', ' \u2013 '),
+             ("'", '\u2019'), (' ', '\u00a0'), ('. ', '.\u2002 ')]
+    lines = []
+    for line in text.split('\n'):
+        for plain, noisy in swaps:
+            if rng.random() < 0.3:
+                line = line.replace(plain, noisy)
+        if rng.random() < 0.2:
+            line = rng.choice(['\u25cf ', '\uf0b7 ', '\u2022  ']) + line
+        lines.append(' ' * rng.randint(0, 3) + line + ' ' * rng.randint(0, 2))
+        if rng.random() < 0.1:
+            lines.append(' ' * rng.randint(0, 4))
+    return '\r\n'.join(lines)
+
+
+def adversarial_inputs() -> Dict[str, str]:
+    """Inputs that stress regex backtracking and single-line handling"""
+    return {
+        'digit_run_100k': '9' * 100_000,
+        'digits_and_spaces': ' '.join(['123456789'] * 20_000),
+        'single_line_1mb': ' '.join(
+            generate_resume(7, pages=1).replace('\n', ' ') for _ in range(250)
+        )[:1_000_000],
+        'currency_noise': '$1,' * 50_000,
+        'percent_noise': '% 1 ' * 50_000,
+        'header_storm': '\n'.join([h for variants in HEADERS.values() for h in variants] * 500),
+        'unicode_whitespace': ('Led the team by​20%\n' * 20_000),
+    }
+
+
+def corpus(seed: int = 42, page_counts: Tuple[int, ...] = (1, 2, 5, 10, 20, 50)) -> Dict[str, Tuple[str, str]]:
+    """{case_name: (resume_text, job_title)} for the benchmark run"""
+    rng = random.Random(seed)
+    cases = {
+        f"resume_{pages}p": (generate_resume(seed + pages, pages), rng.choice(JOB_TITLES))
+        for pages in page_counts
+    }
+    for name, text in adversarial_inputs().items():
+        cases[name] = (text, rng.choice(JOB_TITLES))
+    return cases
+
+
+def known_titles() -> List[str]:
+    """A deterministic stand-in for standardised_job_titles"""
+    levels = ['', 'Senior ', 'Junior ', 'Lead ', 'Principal ']
+    areas = ['Software', 'Data', 'Marketing', 'Finance', 'Sales', 'Operations', 'Product', 'Security']
+    roles = ['Engineer', 'Analyst', 'Manager', 'Consultant', 'Specialist', 'Director', 'Architect']
+    return [f"{level}{area} {role}" for level in levels for area in areas for role in roles] + JOB_TITLES
@@ -0,0 +1,72 @@
+"""Start-up benchmark for resume_analyser.py.
+
+Runs `python -X importtime -c "import resume_analyser"` in a fresh
+interpreter, prints the slowest imports and fails when the total exceeds the
+budget or when a heavy dependency is imported eagerly.
+
+    python ai/benchmarks/import_time.py [--budget-ms 100] [--top 15]
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must only be imported on first real use; asyncio belongs to the opinion
+# worker alone, and queuing an opinion (opinion_spool) must not pull it in
+LAZY_MODULES = ('spacy', 'numpy', 'scipy', 'mysql', 'groq', 'pytesseract', 'pdf2image', 'asyncio')
+
+
+def measure_imports(module: str = 'resume_analyser'):
+    """Returns [(cumulative_us, self_us, depth, name)] for every module imported"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=AI_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # Nesting is shown as two extra spaces per level after one separator space
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        rows.append((int(cumulative_us), int(self_us), depth, name.strip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--module', default='resume_analyser')
+    parser.add_argument('--budget-ms', type=float, default=100.0)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    rows = measure_imports(args.module)
+    total_ms = sum(cumulative for cumulative, _, depth, _ in rows if depth == 0) / 1000
+
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative, self_us, depth, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"{cumulative / 1000:14.1f} {self_us / 1000:9.1f}  {'  ' * depth}{name}")
+    print(f"\nTotal import time: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    eager = sorted({
+        name.split('.')[0] for _, _, _, name in rows
+        if name.split('.')[0] in LAZY_MODULES
+    })
+    failed = False
+    if eager:
+        print(f"FAIL: imported eagerly: {', '.join(eager)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print("FAIL: import time over budget")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Worst-case benchmark for metric extraction.
+
+Runs the previous metric_pattern alternation and metric_extractor.find_metrics
+over pathological inputs at growing sizes. "current" lifts the extractor's
+caps so the scan itself is measured: linear time shows as a constant ns/char
+column, and "x10" is the slowdown when the input grows tenfold. "capped" is
+what the analyser actually pays with METRIC_MAX_INPUT_CHARS and
+METRIC_MAX_MATCHES in force; it stops growing once the caps are reached.
+
+    python ai/benchmarks/metric_worst_case.py [--sizes 10000 100000 1000000]
+"""
+import os
+import re
+import sys
+import time
+import argparse
+
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AI_DIR)
+
+from metric_extractor import find_metrics
+
+# ResumeAnalyzer.metric_pattern before the tokenizer
+LEGACY_PATTERN = re.compile(
+    r'(?:\$\d[\d,]+|\d+\s*%|\d+\s*x|\d+\s*\+|\d+\s*years?|\b\d{3,}\b|\d+\s*[\w/]+\b|\d+\+?)',
+    re.I
+)
+
+# name -> builder of an input of about n characters
+INPUTS = {
+    'digit_run': lambda n: '9' * n,
+    'digits_then_space': lambda n: '9' * (n - 1) + ' ',
+    'digit_groups': lambda n: '1,' * (n // 2),
+    'decimal_chain': lambda n: '1.' * (n // 2),
+    'currency_noise': lambda n: '$1,' * (n // 3),
+    'percent_noise': lambda n: '% 1 ' * (n // 4),
+    'digits_and_spaces': lambda n: '123456789 ' * (n // 10),
+    'digit_word_run': lambda n: '9' * (n // 2) + 'a' * (n // 2),
+    'spaced_digits': lambda n: '1 ' * (n // 2),
+}
+
+
+def legacy(text: str):
+    return [metric for metric in LEGACY_PATTERN.findall(text) if len(metric) > 2]
+
+
+def current(text: str):
+    return find_metrics(text, max_chars=len(text), max_matches=len(text))
+
+
+def capped(text: str):
+    return find_metrics(text)
+
+
+def best_ms(func, text: str, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(text)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Metric extraction worst-case benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--legacy-limit', type=int, default=1_000_000,
+                        help='Skip the old pattern above this size')
+    args = parser.parse_args()
+
+    print(f"{'input':<18} {'chars':>10} {'legacy':>11} {'ns/char':>8} "
+          f"{'current':>10} {'ns/char':>8} {'x10':>6} {'capped':>10}")
+    for name, build in INPUTS.items():
+        previous = None
+        for size in args.sizes:
+            text = build(size)
+            old = best_ms(legacy, text, args.repeat) if size <= args.legacy_limit else None
+            new = best_ms(current, text, args.repeat)
+            bounded = best_ms(capped, text, args.repeat)
+            growth = f"{new / previous:>5.1f}x" if previous else '     -'
+            old_text = f"{old:>9.2f}ms {old * 1e6 / len(text):>8.1f}" if old is not None else f"{'-':>11} {'-':>8}"
+            print(f"{name:<18} {len(text):>10,} {old_text} {new:>8.2f}ms {new * 1e6 / len(text):>8.1f} {growth} {bounded:>8.2f}ms")
+            previous = new
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""OCR pre-processing benchmark.
+
+Rasterises a PDF once, then OCRs every page through the fixed-threshold path
+(binarize_fixed) and the NumPy pipeline (ocr_preprocess.preprocess), and
+prints per-page pre-processing time, OCR time, pixels sent to Tesseract and
+characters recovered.
+
+    python ai/benchmarks/ocr_preprocess.py [--pdf ai/test_cv.pdf] [--dpi 200] [--repeat 3]
+"""
+import os
+import sys
+import time
+import argparse
+
+AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AI_DIR)
+
+
+def _best_of(repeat: int, func, *args):
+    """(fastest seconds, result) over `repeat` runs"""
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_path(name: str, prepare, pages, repeat: int):
+    import pytesseract
+
+    rows = []
+    for page_no, img in enumerate(pages, 1):
+        prep_s, prepared = _best_of(repeat, prepare, img)
+        ocr_s, text = _best_of(repeat, pytesseract.image_to_string, prepared)
+        rows.append((name, page_no, prep_s, ocr_s, prepared.width * prepared.height, len(text.strip())))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare OCR pre-processing paths")
+    parser.add_argument('--pdf', default=os.path.join(AI_DIR, 'test_cv.pdf'))
+    parser.add_argument('--dpi', type=int, default=200, help="pdf2image's default resolution")
+    parser.add_argument('--repeat', type=int, default=3, help='Best of N runs per page')
+    args = parser.parse_args()
+
+    from pdf2image import convert_from_path
+    from ocr_fallback import binarize_fixed
+    from ocr_preprocess import preprocess
+
+    pages = convert_from_path(args.pdf, dpi=args.dpi)
+    rows = run_path('fixed-128', binarize_fixed, pages, args.repeat)
+    rows += run_path('numpy', preprocess, pages, args.repeat)
+
+    print(f"{'path':<10} {'page':>4} {'prep ms':>9} {'ocr ms':>9} {'pixels':>11} {'chars':>7}")
+    for name, page_no, prep_s, ocr_s, pixels, chars in rows:
+        print(f"{name:<10} {page_no:>4} {prep_s * 1000:>9.1f} {ocr_s * 1000:>9.1f} {pixels:>11,} {chars:>7}")
+
+    totals = {}
+    for name, _, prep_s, ocr_s, pixels, chars in rows:
+        total = totals.setdefault(name, [0.0, 0, 0])
+        total[0] += prep_s + ocr_s
+        total[1] += pixels
+        total[2] += chars
+    print()
+    for name, (seconds, pixels, chars) in totals.items():
+        print(f"{name:<10} total {seconds * 1000:>9.1f} ms  {pixels:>11,} px  {chars:>7} chars")
+
+    baseline, candidate = totals['fixed-128'][0], totals['numpy'][0]
+    print(f"\nspeed-up: {baseline / candidate:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
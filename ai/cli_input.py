@@ -0,0 +1,122 @@
+"""Input protocol shared by the command-line entry points.
+
+Besides the legacy `SCRIPT BASE64_DOCUMENT BASE64_TITLE` arguments, a script
+accepts either
+
+    SCRIPT --file PATH --job-title TITLE    document read from a file (memory-mapped)
+    SCRIPT --stdin                          two frames on stdin: document, then job title
+
+where a frame is a 4-byte big-endian length followed by that many bytes.
+Neither form is limited by ARG_MAX or inflated by base64. Arguments are
+taken as the legacy form only when the first one does not start with '--'.
+"""
+import os
+import sys
+import mmap
+import argparse
+import struct
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+_LENGTH = struct.Struct('>I')
+
+
+def read_frame(stream: BinaryIO) -> bytes:
+    """One length-prefixed frame; EOFError if the stream ends early"""
+    header = stream.read(_LENGTH.size)
+    if len(header) < _LENGTH.size:
+        raise EOFError("missing frame header")
+    (length,) = _LENGTH.unpack(header)
+    payload = stream.read(length)
+    if len(payload) < length:
+        raise EOFError(f"frame truncated at {len(payload)} of {length} bytes")
+    return payload
+
+
+def write_frame(stream: BinaryIO, payload: bytes):
+    stream.write(_LENGTH.pack(len(payload)))
+    stream.write(payload)
+
+
+class InputDocument:
+    """A document given by path or by bytes, read without extra copies"""
+
+    def __init__(self, path: Optional[str] = None, data: Optional[bytes] = None):
+        self.path = path
+        self._data = data
+        self._map = None
+
+    @property
+    def data(self):
+        """Document bytes; a read-only memory map for path inputs"""
+        if self._data is None:
+            with open(self.path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    self._data = b''
+                else:
+                    self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._data = self._map
+        return self._data
+
+    def text(self) -> str:
+        return str(self.data, 'utf-8', 'ignore')
+
+    @contextmanager
+    def as_path(self) -> Iterator[str]:
+        """A filesystem path for tools that need one (pdftotext, pdftoppm)"""
+        if self.path:
+            yield self.path
+            return
+        fd, path = tempfile.mkstemp(suffix='.pdf')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._data)
+            yield path
+        finally:
+            os.unlink(path)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._data = None
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    """Raises ValueError instead of exiting, so callers can answer in JSON"""
+
+    def error(self, message: str):
+        raise ValueError(message)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = _ArgumentParser(prog=os.path.basename(sys.argv[0]), add_help=False)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--file', metavar='PATH', help='Document to read')
+    source.add_argument('--stdin', action='store_true', help='Document and job title as frames on stdin')
+    parser.add_argument('--job-title', help='Required with --file')
+    return parser
+
+
+def read_input(argv: List[str]) -> Optional[Tuple[InputDocument, str]]:
+    """(document, job_title) for --file / --stdin, None for legacy base64 argv.
+
+    Options may come in any order; a missing or unexpected option raises
+    ValueError.
+    """
+    if not argv or not argv[0].startswith('--'):
+        return None
+
+    args = _parser().parse_args(argv)
+    if args.stdin:
+        if args.job_title is not None:
+            raise ValueError("--job-title cannot be combined with --stdin (the title is the second frame)")
+        stream = sys.stdin.buffer
+        document = read_frame(stream)
+        job_title = read_frame(stream).decode('utf-8')
+        return InputDocument(data=document), job_title
+
+    if not args.job_title:
+        raise ValueError("--file needs --job-title")
+    return InputDocument(path=args.file), args.job_title
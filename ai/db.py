@@ -0,0 +1,274 @@
+"""Shared database access for the analyser and the fixer scripts.
+
+Connections are opened lazily from fixer/config.py's DB_CONFIG and kept in a
+small bounded pool. Queries are referenced by name so each backend can reuse
+prepared statements. When the database is unreachable, queries return None
+and are retried after a back-off instead of failing the analysis.
+
+Set DB_BACKEND=sqlite to use a local SQLite file instead of MySQL.
+"""
+import os
+import sys
+import time
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence
+
+from fixer.config import DB_BACKEND, DB_CONFIG, DB_SQLITE_PATH
+from timings import stage
+import metrics
+
+# MySQL syntax; '%s' placeholders are rewritten to '?' for SQLite
+STATEMENTS = {
+    'title_exists': """SELECT 1 FROM standardised_job_titles
+                       WHERE standardised_title = %s LIMIT 1""",
+    'titles_since': """SELECT id, original_title, standardised_title
+                       FROM standardised_job_titles
+                       WHERE id > %s ORDER BY id""",
+    'import_title': """INSERT INTO standardised_job_titles
+                       (original_code, original_title, standardised_title)
+                       VALUES (%s, %s, %s)
+                       ON DUPLICATE KEY UPDATE
+                       standardised_title = VALUES(standardised_title)""",
+    'count_titles': """SELECT COUNT(*) FROM standardised_job_titles""",
+    'sample_transformations': """SELECT original_title, standardised_title
+                                 FROM standardised_job_titles
+                                 WHERE original_title != standardised_title
+                                 LIMIT 5""",
+    'count_learned_title': """INSERT INTO learned_job_titles (title, count)
+                              VALUES (%s, %s)
+                              ON DUPLICATE KEY UPDATE count = count + VALUES(count)""",
+    'promotable_titles': """SELECT title FROM learned_job_titles
+                            WHERE promoted = 0 AND count >= %s""",
+    'mark_promoted': """UPDATE learned_job_titles SET promoted = 1 WHERE title = %s""",
+}
+
+SQLITE_STATEMENTS = {
+    'import_title': """INSERT INTO standardised_job_titles
+                       (original_code, original_title, standardised_title)
+                       VALUES (?, ?, ?)
+                       ON CONFLICT(original_code) DO UPDATE SET
+                       standardised_title = excluded.standardised_title""",
+    'count_learned_title': """INSERT INTO learned_job_titles (title, count)
+                              VALUES (?, ?)
+                              ON CONFLICT(title) DO UPDATE SET
+                              count = count + excluded.count""",
+}
+
+SCHEMA = {
+    'mysql': [
+        """CREATE TABLE IF NOT EXISTS standardised_job_titles (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            original_code VARCHAR(20) NOT NULL,
+            original_title VARCHAR(255) NOT NULL,
+            standardised_title VARCHAR(255) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE KEY (original_code)
+        )""",
+        """CREATE TABLE IF NOT EXISTS learned_job_titles (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            title VARCHAR(255) NOT NULL,
+            count INT UNSIGNED NOT NULL DEFAULT 0,
+            promoted TINYINT(1) NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE KEY (title)
+        )""",
+    ],
+    'sqlite': [
+        """CREATE TABLE IF NOT EXISTS standardised_job_titles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            original_code VARCHAR(20) NOT NULL UNIQUE,
+            original_title VARCHAR(255) NOT NULL,
+            standardised_title VARCHAR(255) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""",
+        """CREATE TABLE IF NOT EXISTS learned_job_titles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title VARCHAR(255) NOT NULL UNIQUE,
+            count INTEGER NOT NULL DEFAULT 0,
+            promoted INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""",
+    ],
+}
+
+
+class DatabaseUnavailable(Exception):
+    pass
+
+
+class Database:
+    def __init__(self, backend: str = DB_BACKEND, config: Dict = None, sqlite_path: str = DB_SQLITE_PATH,
+                 pool_size: int = 4, acquire_timeout: float = 5.0, retry_after: float = 30.0):
+        self.backend = backend
+        self.config = dict(config or DB_CONFIG)
+        self.sqlite_path = sqlite_path
+        self.pool_size = pool_size
+        self.acquire_timeout = acquire_timeout
+        self.retry_after = retry_after
+
+        self.idle = queue.LifoQueue()
+        self.opened = 0
+        self.lock = threading.Lock()
+        self.down_until = 0.0
+        # Per-connection prepared cursors, keyed by id(connection)
+        self.prepared: Dict[int, Dict[str, object]] = {}
+
+    def _connect(self):
+        if self.backend == 'sqlite':
+            connection = sqlite3.connect(self.sqlite_path, timeout=5, check_same_thread=False,
+                                         isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            return connection
+
+        import mysql.connector
+        connection = mysql.connector.connect(**self.config)
+        # Every statement sees the latest committed rows
+        connection.autocommit = True
+        return connection
+
+    def _healthy(self, connection) -> bool:
+        try:
+            if self.backend == 'sqlite':
+                connection.execute("SELECT 1")
+                return True
+            return connection.is_connected()
+        except Exception:
+            return False
+
+    def _discard(self, connection):
+        self.prepared.pop(id(connection), None)
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self.lock:
+            self.opened -= 1
+
+    def _acquire(self):
+        if time.monotonic() < self.down_until:
+            raise DatabaseUnavailable("database marked unavailable")
+
+        while True:
+            try:
+                connection = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            if self._healthy(connection):
+                return connection
+            self._discard(connection)
+
+        with self.lock:
+            can_open = self.opened < self.pool_size
+            if can_open:
+                self.opened += 1
+        if can_open:
+            try:
+                return self._connect()
+            except Exception as e:
+                with self.lock:
+                    self.opened -= 1
+                self.down_until = time.monotonic() + self.retry_after
+                print(f"Database unavailable, retrying in {self.retry_after:.0f}s: {e}", file=sys.stderr)
+                raise DatabaseUnavailable(str(e)) from e
+
+        try:
+            return self.idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            raise DatabaseUnavailable("connection pool exhausted")
+
+    @contextmanager
+    def connection(self):
+        """Borrows a pooled connection; broken connections are not returned"""
+        connection = self._acquire()
+        try:
+            yield connection
+        except Exception:
+            self._discard(connection)
+            raise
+        else:
+            self.idle.put(connection)
+
+    def _cursor(self, connection, name: str):
+        if self.backend == 'sqlite':
+            return connection.cursor(), SQLITE_STATEMENTS.get(name) or STATEMENTS[name].replace('%s', '?')
+
+        # A prepared cursor re-executing the same SQL skips the re-parse
+        cursors = self.prepared.setdefault(id(connection), {})
+        if name not in cursors:
+            cursors[name] = connection.cursor(prepared=True)
+        return cursors[name], STATEMENTS[name]
+
+    def query(self, name: str, params: Sequence = ()) -> Optional[List[tuple]]:
+        """Rows of a named SELECT, or None when the database is unavailable"""
+        started = time.perf_counter()
+        try:
+            with stage(f'db.{name}'), self.connection() as connection:
+                cursor, sql = self._cursor(connection, name)
+                cursor.execute(sql, tuple(params))
+                rows = [tuple(row) for row in cursor.fetchall()]
+            metrics.observe('db_query_seconds', time.perf_counter() - started, statement=name)
+            return rows
+        except DatabaseUnavailable:
+            return None
+        except Exception as e:
+            print(f"Query '{name}' failed: {e}", file=sys.stderr)
+            return None
+
+    def execute(self, name: str, params: Sequence = ()) -> bool:
+        """Runs a named write; False when it could not be applied"""
+        return self.executemany(name, [params])
+
+    def executemany(self, name: str, rows: Sequence[Sequence]) -> bool:
+        started = time.perf_counter()
+        try:
+            with stage(f'db.{name}'), self.connection() as connection:
+                cursor, sql = self._cursor(connection, name)
+                if self.backend == 'sqlite':
+                    with connection:
+                        connection.execute("BEGIN")
+                        cursor.executemany(sql, [tuple(r) for r in rows])
+                else:
+                    connection.start_transaction()
+                    for row in rows:
+                        cursor.execute(sql, tuple(row))
+                    connection.commit()
+            metrics.observe('db_query_seconds', time.perf_counter() - started, statement=name)
+            return True
+        except DatabaseUnavailable:
+            return False
+        except Exception as e:
+            print(f"Statement '{name}' failed: {e}", file=sys.stderr)
+            return False
+
+    def init_schema(self):
+        """Creates the tables the analyser needs (idempotent)"""
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            for statement in SCHEMA[self.backend]:
+                cursor.execute(statement)
+            cursor.close()
+
+    def close(self):
+        while True:
+            try:
+                self._discard(self.idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+_database = None
+_database_pid = None
+_database_lock = threading.Lock()
+
+
+def get_database() -> Database:
+    """Process-wide pool, created on first use and again in forked children"""
+    global _database, _database_pid
+    with _database_lock:
+        if _database is None or _database_pid != os.getpid():
+            _database = Database()
+            _database_pid = os.getpid()
+        return _database
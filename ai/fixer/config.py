@@ -1,11 +1,21 @@
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:  # plain environment variables still work
+    pass
 
 DB_CONFIG = {
     'host': os.getenv('DB_HOST', 'localhost'),
     'user': os.getenv('DB_USER', 'root'),
     'password': os.getenv('DB_PASSWORD', ''),
     'database': os.getenv('DB_NAME', 'ats_blitz')
-}
\ No newline at end of file
+}
+
+# 'mysql' or 'sqlite' (runs the whole stack without a MySQL server)
+DB_BACKEND = os.getenv('DB_BACKEND', 'mysql')
+
+DB_SQLITE_PATH = os.getenv('DB_SQLITE_PATH', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'database', 'database.sqlite'
+))
@@ -1,33 +1,29 @@
-import mysql.connector
-from config import DB_CONFIG
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DB_BACKEND, DB_CONFIG
+from db import get_database
 
 def initialize_database():
-    conn = mysql.connector.connect(
-        host=DB_CONFIG['host'],
-        user=DB_CONFIG['user'],
-        password=DB_CONFIG['password']
-    )
-    cursor = conn.cursor()
-    
-    # Create database
-    cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_CONFIG['database']}")
-    cursor.execute(f"USE {DB_CONFIG['database']}")
-    
-    # Create table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS standardised_job_titles (
-        id INT AUTO_INCREMENT PRIMARY KEY,
-        original_code VARCHAR(20) NOT NULL,
-        original_title VARCHAR(255) NOT NULL,
-        standardised_title VARCHAR(255) NOT NULL,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        UNIQUE KEY (original_code)
-    )""")
+    if DB_BACKEND == 'mysql':
+        # The database itself must exist before the pool can connect to it
+        import mysql.connector
+        conn = mysql.connector.connect(
+            host=DB_CONFIG['host'],
+            user=DB_CONFIG['user'],
+            password=DB_CONFIG['password']
+        )
+        cursor = conn.cursor()
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {DB_CONFIG['database']}")
+        conn.commit()
+        cursor.close()
+        conn.close()
     
-    conn.commit()
-    cursor.close()
-    conn.close()
+    # Create tables
+    get_database().init_schema()
 
 if __name__ == "__main__":
     initialize_database()
-    print("Database initialised successfully")
\ No newline at end of file
+    print("Database initialised successfully")
@@ -1,28 +1,28 @@
+import os
+import sys
 import pandas as pd
-import mysql.connector
-from config import DB_CONFIG
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import get_database
 
 def verify_import():
-    conn = mysql.connector.connect(**DB_CONFIG)
+    db = get_database()
     
     # Compare counts
-    mysql_count = pd.read_sql("SELECT COUNT(*) FROM standardised_job_titles", conn).iloc[0,0]
+    db_count = (db.query('count_titles') or [(0,)])[0][0]
     excel_count = len(pd.read_excel("cleaned_job_titles.xlsx"))
     
-    print(f"MySQL records: {mysql_count} | Excel records: {excel_count}")
+    print(f"Database records: {db_count} | Excel records: {excel_count}")
     
     # Sample verification
-    sample = pd.read_sql("""
-    SELECT original_title, standardised_title 
-    FROM standardised_job_titles
-    WHERE original_title != standardised_title
-    LIMIT 5
-    """, conn)
+    sample = pd.DataFrame(
+        db.query('sample_transformations') or [],
+        columns=['original_title', 'standardised_title']
+    )
     
     print("\nSample transformations:")
     print(sample)
-    
-    conn.close()
 
 if __name__ == "__main__":
-    verify_import()
\ No newline at end of file
+    verify_import()
@@ -0,0 +1,93 @@
+import os
+import re
+from typing import List, Tuple
+
+# Only this much of a resume is searched for metrics; a 50-page resume is ~90k characters
+METRIC_MAX_INPUT_CHARS = int(os.getenv('METRIC_MAX_INPUT_CHARS', 200_000))
+# Scanning stops after this many metrics; scoring saturates long before
+METRIC_MAX_MATCHES = int(os.getenv('METRIC_MAX_MATCHES', 200))
+# Longer numbers ("1,250,000,000.50" is 16) are OCR digit runs or identifiers, not claims
+METRIC_MAX_VALUE_CHARS = 20
+
+KINDS = ('money', 'percent', 'multiplier', 'duration', 'count')
+
+_UNIT_KINDS = {
+    **dict.fromkeys(('%', 'percent'), 'percent'),
+    **dict.fromkeys(('x', 'times'), 'multiplier'),
+    **dict.fromkeys(('usd', 'eur', 'gbp', 'dollars', 'euros', 'pounds'), 'money'),
+    **dict.fromkeys(('year', 'years', 'yr', 'yrs', 'month', 'months', 'week', 'weeks', 'day', 'days',
+                     'hour', 'hours', 'hr', 'hrs', 'minute', 'minutes', 'min', 'mins',
+                     'second', 'seconds', 'sec', 'secs', 'ms'), 'duration'),
+    # Magnitudes and "10+" are counts unless a currency sign makes them money
+    **dict.fromkeys(('+', 'k', 'm', 'bn', 'million', 'billion', 'thousand'), 'count'),
+}
+
+# Words after a bare number that do not make it a count ("from 5 to 10")
+_NOT_COUNTED = frozenset((
+    'and', 'the', 'for', 'with', 'from', 'into', 'than', 'per', 'over', 'under', 'across', 'of',
+    'jan', 'feb', 'mar', 'apr', 'april', 'may', 'june', 'july', 'aug', 'sep', 'oct', 'nov', 'dec',
+    'present',
+))
+
+# One numeric token per match, run on lowercased text. The pattern opens with
+# a consumed [$£€\d] class so the regex engine skips straight to candidate
+# characters. A number starts only where no digit, letter, separator or '/'
+# precedes it (the 5 in "4.5/5" is the scale of a ratio, not a new count),
+# has at most four '.'/',' separated digit groups, and takes one optional
+# unit and one optional noun. The closing conditional drops bare
+# numbers shorter than three digits inside the regex, without a Python call.
+# No part re-scans text before its token, so a search is linear in the input.
+METRIC_PATTERN = re.compile(
+    r'[$£€\d]'
+    r'(?:(?<=(?P<currency>[$£€])) ?\d+|(?<![\w.,/]\d)\d*)(?:[.,]\d+){0,4}(?![.,]?\d)(?P<value_end>)'
+    r'(?: ?(?P<unit>%|\+|percent|times|usd|eur|gbp|dollars|euros|pounds|million|billion|thousand|bn'
+    r'|years?|yrs?|months?|weeks?|days?|hours?|hrs?|minutes?|mins?|seconds?|secs?|ms|x|k|m)(?![a-z]))?'
+    r'(?: (?P<noun>[a-z]{3,}))?'
+    r'(?(currency)|(?(unit)|(?(noun)|(?<=\d{3}))))'
+)
+
+
+def _is_year(value: str) -> bool:
+    return len(value) == 4 and value[:2] in ('19', '20')
+
+
+def find_metrics(text: str, max_chars: int = METRIC_MAX_INPUT_CHARS,
+                 max_matches: int = METRIC_MAX_MATCHES) -> List[Tuple[str, str]]:
+    """[(kind, text)] of the quantified claims in a resume, in order.
+
+    kind is one of KINDS. Bare years, small bare numbers and numbers longer
+    than METRIC_MAX_VALUE_CHARS are not metrics; a bare number counts when
+    it has three or more digits or is followed by a noun ("5 engineers").
+    Expects cleaned text (ASCII plus £ and €), whose lowercase form has the
+    same offsets.
+    """
+    found = []
+    lower = text[:max_chars].lower()
+    for match in METRIC_PATTERN.finditer(lower):
+        start, value_end = match.start(), match.end('value_end')
+        currency, unit, noun = match.group('currency', 'unit', 'noun')
+        value = lower[start + 1 if currency else start:value_end].lstrip()
+        if len(value) > METRIC_MAX_VALUE_CHARS:
+            continue
+        if noun in _NOT_COUNTED:
+            noun = None
+
+        if unit:
+            kind = _UNIT_KINDS[unit]
+            if currency and kind == 'count':
+                kind = 'money'
+            elif unit == '+' and _UNIT_KINDS.get(noun) == 'duration':
+                kind = 'duration'
+        elif currency:
+            kind = 'money'
+        elif _is_year(value) or not (noun or len(value) >= 3):
+            continue
+        else:
+            kind = 'count'
+
+        # Counts and "10+ years" keep their noun ("5 engineers"); other kinds end at the unit
+        end = match.end() if noun and (kind == 'count' or unit == '+' and kind == 'duration') else match.end('unit') if unit else value_end
+        found.append((kind, text[start:end]))
+        if len(found) >= max_matches:
+            break
+    return found
@@ -0,0 +1,326 @@
+"""In-process metrics with Prometheus text exposition.
+
+Every process (pre-forked workers, OCR pool processes, the opinion worker,
+one-off CLI runs) records into its own registry and periodically writes a
+snapshot to METRICS_DIR/<pid>.json. The exporter merges all snapshots, so
+counters and histograms add up across processes:
+
+    python ai/metrics.py --serve 9464              # http://127.0.0.1:9464/metrics
+    python ai/metrics.py --textfile metrics.prom   # for node_exporter's textfile collector
+    python ai/metrics.py --summary                 # p50/p95/p99 of every histogram
+
+ANALYSER_METRICS=0 turns recording off.
+"""
+import os
+import sys
+import json
+import glob
+import time
+import atexit
+import argparse
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+METRICS_ENABLED = os.getenv('ANALYSER_METRICS', '1') != '0'
+METRICS_DIR = os.getenv('METRICS_DIR', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'storage', 'app', 'metrics'
+))
+FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 10))
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# name -> (type, help, buckets)
+DEFINITIONS = {
+    'analyser_request_seconds': ('histogram', 'analyze_resume latency', LATENCY_BUCKETS),
+    'ocr_page_seconds': ('histogram', 'Rasterise and OCR time per page', LATENCY_BUCKETS),
+    'opinion_llm_seconds': ('histogram', 'Opinion backend call latency', LATENCY_BUCKETS),
+    'db_query_seconds': ('histogram', 'Database statement latency', LATENCY_BUCKETS),
+    'analysis_errors_total': ('counter', 'Error responses returned by the analyser', None),
+    'title_match_fallback_total': ('counter', 'Title matches that fell back to similarity scoring', None),
+    'extraction_pages_total': ('counter', 'PDF pages extracted, by method (text layer or OCR)', None),
+    'cache_lookups_total': ('counter', 'Result cache lookups by outcome', None),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Registry:
+    """Counters and histograms keyed by (name, sorted label pairs)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        # [bucket counts..., +Inf count], sum
+        self.histograms: Dict[Tuple[str, Labels], List] = {}
+
+    def reset(self):
+        with self.lock:
+            self.counters = {}
+            self.histograms = {}
+
+    def reset_after_fork(self):
+        """Empties a forked child's registry without touching the inherited lock.
+
+        The parent's flush thread may have held the lock at the moment of
+        fork; that thread does not exist in the child, so the lock would
+        never be released.
+        """
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+
+    def inc(self, name: str, amount: float = 1.0, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0.0) + amount
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        buckets = DEFINITIONS[name][2]
+        with self.lock:
+            entry = self.histograms.get(key)
+            if entry is None:
+                entry = self.histograms[key] = [[0] * (len(buckets) + 1), 0.0]
+            entry[0][bisect_left(buckets, seconds)] += 1
+            entry[1] += seconds
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                'histograms': [[name, list(labels), counts[:], total]
+                               for (name, labels), (counts, total) in self.histograms.items()],
+            }
+
+
+class _NullRegistry:
+    def inc(self, *args, **kwargs):
+        pass
+
+    def observe(self, *args, **kwargs):
+        pass
+
+
+_registry = Registry() if METRICS_ENABLED else _NullRegistry()
+_flusher = None
+_flusher_pid = None
+
+
+def registry():
+    """This process's registry; its background flusher starts on first use"""
+    global _flusher, _flusher_pid
+    if METRICS_ENABLED and _flusher_pid != os.getpid():
+        _flusher_pid = os.getpid()
+        _flusher = threading.Thread(target=_flush_loop, name='metrics-flush', daemon=True)
+        _flusher.start()
+        atexit.register(flush)
+    return _registry
+
+
+def inc(name: str, amount: float = 1.0, **labels):
+    registry().inc(name, amount, **labels)
+
+
+def observe(name: str, seconds: float, **labels):
+    registry().observe(name, seconds, **labels)
+
+
+def flush():
+    """Writes this process's snapshot (forked children that os._exit must call it)"""
+    if not METRICS_ENABLED:
+        return
+    try:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        path = os.path.join(METRICS_DIR, f"{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_registry.snapshot(), f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Metrics flush failed: {e}", file=sys.stderr)
+
+
+def _flush_loop():
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        flush()
+
+
+if METRICS_ENABLED:
+    # A forked child starts from zero rather than re-reporting its parent's counts
+    os.register_at_fork(after_in_child=_registry.reset_after_fork)
+
+
+def merge_snapshots(paths: Iterable[str]) -> Registry:
+    merged = Registry()
+    for path in paths:
+        try:
+            with open(path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            merged.counters[key] = merged.counters.get(key, 0.0) + value
+        for name, labels, counts, total in snapshot['histograms']:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            entry = merged.histograms.setdefault(key, [[0] * len(counts), 0.0])
+            entry[0] = [a + b for a, b in zip(entry[0], counts)]
+            entry[1] += total
+    return merged
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def compact(metrics_dir: str = METRICS_DIR):
+    """Folds snapshots of exited processes into retired.json so the directory stays small"""
+    retired_path = os.path.join(metrics_dir, 'retired.json')
+    dead = [
+        path for path in glob.glob(os.path.join(metrics_dir, '*.json'))
+        if os.path.basename(path)[:-5].isdigit() and not _alive(int(os.path.basename(path)[:-5]))
+    ]
+    if not dead:
+        return
+
+    retired = merge_snapshots(dead + [retired_path])
+    tmp_path = f"{retired_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(retired.snapshot(), f)
+    os.replace(tmp_path, retired_path)
+    for path in dead:
+        os.unlink(path)
+
+
+def collect(metrics_dir: str = METRICS_DIR) -> Registry:
+    """Every process's latest snapshot, added together"""
+    try:
+        compact(metrics_dir)
+    except OSError as e:
+        print(f"Metrics compaction skipped: {e}", file=sys.stderr)
+    return merge_snapshots(glob.glob(os.path.join(metrics_dir, '*.json')))
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"') for _, value in pairs)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+
+def render(merged: Registry) -> str:
+    """Prometheus text exposition format (0.0.4)"""
+    lines = []
+    for name, (kind, help_text, buckets) in DEFINITIONS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == 'counter':
+            for (metric, labels), value in sorted(merged.counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(labels)} {value:g}")
+            continue
+        for (metric, labels), (counts, total) in sorted(merged.histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(list(buckets) + ['+Inf'], counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', str(bound)))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {total:.6f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+
+    # Derived from cache_lookups_total so dashboards need no PromQL
+    lookups: Dict[str, List[float]] = {}
+    for (metric, labels), value in merged.counters.items():
+        if metric == 'cache_lookups_total':
+            label_map = dict(labels)
+            entry = lookups.setdefault(label_map.get('cache', ''), [0.0, 0.0])
+            entry[0] += value if label_map.get('result') != 'miss' else 0
+            entry[1] += value
+    lines.append("# HELP cache_hit_ratio Result cache hits over lookups")
+    lines.append("# TYPE cache_hit_ratio gauge")
+    for cache, (hits, total) in sorted(lookups.items()):
+        lines.append(f'cache_hit_ratio{{cache="{cache}"}} {hits / total if total else 0:.4f}')
+    return "\n".join(lines) + "\n"
+
+
+def quantile(buckets: Tuple[float, ...], counts: List[int], q: float) -> Optional[float]:
+    """Histogram quantile with linear interpolation inside the bucket"""
+    total = sum(counts)
+    if not total:
+        return None
+    rank = q * total
+    cumulative, lower = 0, 0.0
+    for bound, count in zip(buckets, counts):
+        if cumulative + count >= rank and count:
+            return lower + (bound - lower) * (rank - cumulative) / count
+        cumulative += count
+        lower = bound
+    return buckets[-1]
+
+
+def summary(merged: Registry) -> str:
+    lines = [f"{'histogram':<28} {'labels':<28} {'count':>7} {'p50':>9} {'p95':>9} {'p99':>9}"]
+    for (name, labels), (counts, _) in sorted(merged.histograms.items()):
+        buckets = DEFINITIONS[name][2]
+        values = [quantile(buckets, counts, q) for q in (0.5, 0.95, 0.99)]
+        label_text = ','.join(f"{k}={v}" for k, v in labels) or '-'
+        lines.append(f"{name:<28} {label_text:<28} {sum(counts):>7} "
+                     + ' '.join(f"{v * 1000:>7.1f}ms" for v in values))
+    return "\n".join(lines)
+
+
+def serve(port: int, metrics_dir: str = METRICS_DIR):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = render(collect(metrics_dir)).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    # Local only: the endpoint has no authentication
+    ThreadingHTTPServer(('127.0.0.1', port), Handler).serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export analyser metrics")
+    parser.add_argument('--dir', default=METRICS_DIR, help='Directory of per-process snapshots')
+    parser.add_argument('--serve', type=int, metavar='PORT', help='Serve /metrics on 127.0.0.1:PORT')
+    parser.add_argument('--textfile', help='Write the exposition to this file')
+    parser.add_argument('--summary', action='store_true', help='Print p50/p95/p99 per histogram')
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.dir)
+    elif args.textfile:
+        tmp_path = f"{args.textfile}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(render(collect(args.dir)))
+        os.replace(tmp_path, args.textfile)
+    elif args.summary:
+        print(summary(collect(args.dir)))
+    else:
+        sys.stdout.write(render(collect(args.dir)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,187 @@
+import os
 import sys
+import json
+import time
 import base64
+import hashlib
+import multiprocessing
 import pytesseract
-from pdf2image import convert_from_bytes
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pdf2image import convert_from_path, pdfinfo_from_path
 from PIL import Image
-import io
-import subprocess
+from typing import Iterator, Optional, Sequence, Tuple
+from cli_input import InputDocument, read_input
+from result_cache import ResultCache, cache_key
+import metrics
+
+OCR_DPI = int(os.getenv('OCR_DPI', 200))
+
+# Stop OCR once this many characters are recovered (0 reads every page)
+OCR_ENOUGH_CHARS = int(os.getenv('OCR_ENOUGH_CHARS', 0))
+
+# Recognised text per rendered page; OCR_CACHE=0 disables it
+OCR_CACHE_ENABLED = os.getenv('OCR_CACHE', '1') != '0'
+OCR_CACHE_MAX_BYTES = int(os.getenv('OCR_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+_page_cache = None
+_page_cache_pid = None
+_ocr_settings = None
+
+def binarize_fixed(img):
+    """Fixed-threshold binarisation, used when NumPy is not installed"""
+    return img.convert('L').point(lambda x: 0 if x < 128 else 255, '1')
 
 def improve_image(img):
     """Enhance image for better OCR results"""
-    return img.convert('L').point(lambda x: 0 if x < 128 else 255, '1')
+    try:
+        from ocr_preprocess import preprocess
+    except ImportError:
+        return binarize_fixed(img)
+    return preprocess(img)
+
+def get_page_cache() -> Optional[ResultCache]:
+    """This process's page cache (pool workers each open their own connection)"""
+    global _page_cache, _page_cache_pid
+    if not OCR_CACHE_ENABLED:
+        return None
+    if _page_cache is None or _page_cache_pid != os.getpid():
+        _page_cache = ResultCache('ocr_pages', memory_entries=64, max_bytes=OCR_CACHE_MAX_BYTES)
+        _page_cache_pid = os.getpid()
+    return _page_cache
+
+def ocr_settings() -> str:
+    """Everything besides the page pixels that changes the recognised text"""
+    global _ocr_settings
+    if _ocr_settings is None:
+        try:
+            from ocr_preprocess import TARGET_LINE_HEIGHT
+            preprocessing = f"numpy-{TARGET_LINE_HEIGHT}"
+        except ImportError:
+            preprocessing = "fixed-128"
+        _ocr_settings = f"tesseract-{pytesseract.get_tesseract_version()}|{preprocessing}"
+    return _ocr_settings
+
+def page_cache_key(img, dpi: int) -> str:
+    digest = hashlib.blake2b(img.tobytes(), digest_size=32).hexdigest()
+    return cache_key(digest, img.mode, f"{img.width}x{img.height}", str(dpi), ocr_settings())
+
+def ocr_page(pdf_path: str, page_no: int, dpi: int = OCR_DPI) -> Tuple[int, str, float]:
+    """Rasterises and OCRs a single page, so only that page is ever in memory.
+
+    Pages rendered to the same pixels before are answered from the page cache
+    without running Tesseract. Returns (page_no, text, seconds).
+    """
+    started = time.perf_counter()
+    images = convert_from_path(pdf_path, dpi=dpi, first_page=page_no, last_page=page_no)
+    if not images:
+        return page_no, "", time.perf_counter() - started
+
+    cache = get_page_cache()
+    key = page_cache_key(images[0], dpi) if cache else None
+    cached = cache.get(key) if cache else None
+    if cached is not None:
+        text = cached['text']
+    else:
+        text = pytesseract.image_to_string(improve_image(images[0]))
+        if cache:
+            cache.put(key, {'text': text})
+
+    elapsed = time.perf_counter() - started
+    metrics.observe('ocr_page_seconds', elapsed)
+    # Pool processes exit without running atexit handlers
+    metrics.flush()
+    return page_no, text, elapsed
 
-def extract_text(pdf_bytes):
+def iter_pages(pdf_path: str, pages: Optional[Sequence[int]] = None, workers: Optional[int] = None,
+               dpi: int = OCR_DPI, enough_chars: int = OCR_ENOUGH_CHARS) -> Iterator[Tuple[int, str, float]]:
+    """Yields (page_no, text, seconds) for `pages` (default: all) in page order.
+
+    Pages are OCR'd in a process pool with at most `workers` pages rasterised
+    at a time. With `enough_chars`, pages after the point where that much text
+    has been recovered are never rasterised.
+    """
+    if pages is None:
+        pages = range(1, pdfinfo_from_path(pdf_path)['Pages'] + 1)
+    pages = sorted(pages)
+    if not pages:
+        return
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pages)))
+    recovered = 0
+
+    if workers == 1:
+        for page_no in pages:
+            result = ocr_page(pdf_path, page_no, dpi)
+            yield result
+            recovered += len(result[1].strip())
+            if enough_chars and recovered >= enough_chars:
+                return
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as pool:
+        submitted = 0
+        yielded = 0
+        in_flight = set()
+        done_pages = {}
+
+        try:
+            while yielded < len(pages):
+                while submitted < len(pages) and len(in_flight) < workers:
+                    in_flight.add(pool.submit(ocr_page, pdf_path, pages[submitted], dpi))
+                    submitted += 1
+
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    result = future.result()
+                    done_pages[result[0]] = result
+
+                # Release pages strictly in order
+                while yielded < len(pages) and pages[yielded] in done_pages:
+                    result = done_pages.pop(pages[yielded])
+                    yield result
+                    yielded += 1
+                    recovered += len(result[1].strip())
+                    if enough_chars and recovered >= enough_chars:
+                        return
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+def extract_text_from_path(pdf_path: str, workers: Optional[int] = None, enough_chars: int = OCR_ENOUGH_CHARS):
     try:
-        images = convert_from_bytes(pdf_bytes)
-        full_text = ""
-        for img in images:
-            img = improve_image(img)
-            text = pytesseract.image_to_string(img)
-            full_text += text + "\n"
-        return full_text.strip()
+        pages = [text for _, text, _ in iter_pages(pdf_path, workers=workers, enough_chars=enough_chars)]
+        return "\n".join(pages).strip()
     except Exception as e:
         return f"OCR_ERROR: {str(e)}"
 
+def extract_text(pdf_bytes, workers: Optional[int] = None, enough_chars: int = OCR_ENOUGH_CHARS):
+    with InputDocument(data=pdf_bytes).as_path() as pdf_path:
+        return extract_text_from_path(pdf_path, workers, enough_chars)
+
 if __name__ == "__main__":
     try:
-        if len(sys.argv) < 3:
-            print("ERROR: Missing PDF data or job title", file=sys.stderr)
-            sys.exit(1)
+        # python ocr_fallback.py --file PDF --job-title TITLE | --stdin (see cli_input.py)
+        request = read_input(sys.argv[1:])
+        if request:
+            document, job_title = request
+            with document.as_path() as pdf_path:
+                result = extract_text_from_path(pdf_path)
+        else:
+            if len(sys.argv) < 3:
+                print("ERROR: Missing PDF data or job title", file=sys.stderr)
+                sys.exit(1)
 
-        # Decode base64 inputs
-        pdf_bytes = base64.b64decode(sys.argv[1])
-        job_title = base64.b64decode(sys.argv[2]).decode('utf-8')
-
-        # OCR extract
-        result = extract_text(pdf_bytes)
+            # Legacy: base64 inputs
+            pdf_bytes = base64.b64decode(sys.argv[1])
+            job_title = base64.b64decode(sys.argv[2]).decode('utf-8')
+            result = extract_text(pdf_bytes)
 
         if result.startswith("OCR_ERROR"):
             print(result, file=sys.stderr)
             sys.exit(1)
 
-        # Encode extracted text and job title to pass to resume_analyser.py
-        encoded_text = base64.b64encode(result.encode('utf-8')).decode('utf-8')
-        encoded_title = base64.b64encode(job_title.encode('utf-8')).decode('utf-8')
-
-        # Call resume_analyser.py
-        analyser_result = subprocess.run(
-            ['python3', 'resume_analyser.py', encoded_text, encoded_title],
-            capture_output=True, text=True
-        )
-
-        if analyser_result.returncode != 0:
-            print(f"ANALYSER_ERROR: {analyser_result.stderr.strip()}", file=sys.stderr)
-            sys.exit(1)
-
-        print(analyser_result.stdout.strip())
+        # Analyse in this process rather than starting another interpreter
+        from resume_analyser import ResumeAnalyzer
+        print(json.dumps(ResumeAnalyzer().analyze_resume(result, job_title)))
 
     except Exception as e:
         print(f"FATAL_ERROR: {str(e)}", file=sys.stderr)
@@ -0,0 +1,245 @@
+"""Deferred AI opinion generation.
+
+The analyser only enqueues a job; this module's worker produces the opinion
+in the background and writes it where the results page polls for it:
+
+    <OPINION_DIR>/pending/<id>.json   queued by ResumeAnalyzer (opinion_spool.enqueue)
+    <OPINION_DIR>/running/<id>.json   claimed by the worker
+    <OPINION_DIR>/<id>.json           {"status": "done" | "failed", "opinion": ...}
+
+Run one worker per spool directory:
+
+    python ai/opinion.py [--concurrency 4] [--timeout 30] [--once]
+
+Set OPINION_BACKEND=stub to answer locally without calling Groq.
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from typing import Optional
+
+# The spool and cache helpers live in opinion_spool so the analyser can queue
+# jobs without importing asyncio; they are re-exported here for the worker
+from opinion_spool import (OPINION_DIR, OPINION_MODEL, enqueue, get_opinion_cache, opinion_cache_key,
+                           read_result, write_json)
+import metrics
+
+SYSTEM_PROMPT = (
+    "You are a professional resume expert who helps users tailor their resumes with precision. "
+    "Give a detailed opinion on the resume provided (UK English) by taking into consideration "
+    "the job that the candidate would like to apply for. Remember that the resume is extracted "
+    "text from a pdf/docx, so ignore the formating and links attached and focus on the core content. "
+    "Long resumes are condensed to extracted facts followed by excerpts of their main sections. "
+)
+
+
+class GroqBackend:
+    def __init__(self, api_key: Optional[str] = None, model: str = OPINION_MODEL):
+        from groq import AsyncGroq
+        self.client = AsyncGroq(api_key=api_key or os.getenv('GROQ_API_KEY'))
+        self.model = model
+
+    async def generate(self, resume_text: str, job_title: str) -> str:
+        chat_completion = await self.client.chat.completions.create(
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": resume_text + 'job that is being applied for: ' + job_title},
+            ],
+            model=self.model,
+        )
+        return chat_completion.choices[0].message.content.strip()
+
+
+class StubBackend:
+    """Deterministic local backend for tests and offline runs"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+    async def generate(self, resume_text: str, job_title: str) -> str:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return (
+            f"**Stub opinion**\n\nThis resume ({len(resume_text.split())} words) "
+            f"was reviewed for the '{job_title}' role by the local stub backend."
+        )
+
+
+def make_backend(name: Optional[str] = None):
+    name = name or os.getenv('OPINION_BACKEND', 'groq')
+    if name == 'stub':
+        return StubBackend(float(os.getenv('OPINION_STUB_DELAY', 0)))
+    return GroqBackend()
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """Stops calling the backend after repeated failures.
+
+    After `reset_timeout` seconds one trial call is let through; a success
+    closes the circuit, a failure keeps it open for another period.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+
+    def blocked(self) -> bool:
+        return self.opened_at is not None and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if self.blocked():
+            return False
+        # Half-open: re-arm so only this call probes the backend
+        self.opened_at = time.monotonic()
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class OpinionWorker:
+    def __init__(self, backend, spool_dir: str = OPINION_DIR, concurrency: int = 4,
+                 timeout: float = 30.0, retries: int = 2, backoff: float = 1.0,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.backend = backend
+        self.spool_dir = spool_dir
+        self.pending_dir = os.path.join(spool_dir, 'pending')
+        self.running_dir = os.path.join(spool_dir, 'running')
+        self.concurrency = concurrency
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.cache = get_opinion_cache()
+
+        os.makedirs(self.pending_dir, exist_ok=True)
+        os.makedirs(self.running_dir, exist_ok=True)
+
+    async def generate(self, resume_text: str, job_title: str) -> str:
+        """One opinion with per-call timeout, retry with jittered backoff and the breaker"""
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            if not self.breaker.allow():
+                raise CircuitOpenError("opinion backend circuit is open")
+            started = time.perf_counter()
+            try:
+                async with self.semaphore:
+                    started = time.perf_counter()
+                    opinion = await asyncio.wait_for(
+                        self.backend.generate(resume_text, job_title), self.timeout
+                    )
+                metrics.observe('opinion_llm_seconds', time.perf_counter() - started, outcome='ok')
+                self.breaker.record_success()
+                return opinion
+            except Exception as e:
+                outcome = 'timeout' if isinstance(e, asyncio.TimeoutError) else 'error'
+                metrics.observe('opinion_llm_seconds', time.perf_counter() - started, outcome=outcome)
+                self.breaker.record_failure()
+                print(f"Opinion attempt {attempt + 1} failed: {e!r}", file=sys.stderr)
+                if attempt == self.retries:
+                    raise
+                await asyncio.sleep(delay + random.uniform(0, delay))
+                delay *= 2
+
+    def _claim(self, name: str) -> Optional[str]:
+        """Moves a pending job to running; None if another worker took it"""
+        running_path = os.path.join(self.running_dir, name)
+        try:
+            os.rename(os.path.join(self.pending_dir, name), running_path)
+        except FileNotFoundError:
+            return None
+        return running_path
+
+    async def process(self, running_path: str):
+        with open(running_path, encoding='utf-8') as f:
+            job = json.load(f)
+
+        key = job.get('cache_key')
+        cached = self.cache.get(key) if key else None
+
+        try:
+            if cached:
+                opinion = cached['opinion']
+            else:
+                opinion = await self.generate(job['resume_text'], job['job_title'])
+                if key:
+                    self.cache.put(key, {'opinion': opinion})
+            result = {'status': 'done', 'opinion': opinion}
+        except CircuitOpenError:
+            # Leave it for when the backend recovers
+            os.replace(running_path, os.path.join(self.pending_dir, os.path.basename(running_path)))
+            return
+        except Exception as e:
+            result = {'status': 'failed', 'opinion': None, 'error': str(e)}
+
+        write_json(os.path.join(self.spool_dir, f"{job['id']}.json"), result)
+        os.unlink(running_path)
+
+    def recover(self):
+        """Requeues jobs left running by a previous worker that died"""
+        for name in os.listdir(self.running_dir):
+            if name.endswith('.json'):
+                os.replace(os.path.join(self.running_dir, name), os.path.join(self.pending_dir, name))
+
+    async def serve(self, poll_interval: float = 0.5, once: bool = False):
+        """Claims queued jobs and runs up to 2x `concurrency` of them at a time"""
+        self.recover()
+        tasks = set()
+
+        while True:
+            if not self.breaker.blocked():
+                for name in sorted(os.listdir(self.pending_dir)):
+                    if len(tasks) >= self.concurrency * 2:
+                        break
+                    if not name.endswith('.json'):
+                        continue
+                    running_path = self._claim(name)
+                    if running_path:
+                        tasks.add(asyncio.create_task(self.process(running_path)))
+
+            if once and not tasks:
+                break
+            if tasks:
+                _, tasks = await asyncio.wait(tasks, timeout=poll_interval, return_when=asyncio.FIRST_COMPLETED)
+            else:
+                await asyncio.sleep(poll_interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deferred AI opinion worker")
+    parser.add_argument('--backend', choices=['groq', 'stub'], help='Default: $OPINION_BACKEND or groq')
+    parser.add_argument('--concurrency', type=int, default=4, help='Max simultaneous backend calls')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Seconds per backend call')
+    parser.add_argument('--retries', type=int, default=2)
+    parser.add_argument('--once', action='store_true', help='Drain the queue and exit')
+    args = parser.parse_args()
+
+    async def _run():
+        worker = OpinionWorker(make_backend(args.backend), concurrency=args.concurrency,
+                               timeout=args.timeout, retries=args.retries)
+        await worker.serve(once=args.once)
+
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
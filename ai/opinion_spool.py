@@ -0,0 +1,61 @@
+"""Opinion job spool and cache, shared by the analyser and the opinion worker.
+
+Kept free of asyncio and the LLM client so queuing a job from an analysis
+request costs no more than the file write (see opinion.py for the worker).
+"""
+import os
+import json
+import time
+from typing import Dict, Optional
+
+from result_cache import ResultCache, cache_key
+
+OPINION_DIR = os.getenv('OPINION_DIR', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'storage', 'app', 'opinions'
+))
+
+OPINION_MODEL = "llama-3.3-70b-versatile"
+
+
+def opinion_cache_key(clean_text: str, standardized_title: str, model: str = OPINION_MODEL) -> str:
+    """Opinions do not depend on the scoring rules, so the analyser version is not part of the key"""
+    return cache_key(model, clean_text, standardized_title)
+
+
+def get_opinion_cache() -> ResultCache:
+    # Paid completions are kept longer than scoring results
+    return ResultCache('ai_opinions', ttl=90 * 24 * 3600)
+
+
+def write_json(path: str, data: Dict):
+    """Atomic write so pollers never see a half-written file"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def enqueue(resume_text: str, job_title: str, spool_dir: str = OPINION_DIR,
+            key: Optional[str] = None) -> str:
+    """Queues an opinion job and returns its id"""
+    # Same format as uuid4().hex without importing uuid
+    job_id = os.urandom(16).hex()
+    pending_dir = os.path.join(spool_dir, 'pending')
+    os.makedirs(pending_dir, exist_ok=True)
+    write_json(os.path.join(pending_dir, f"{job_id}.json"), {
+        'id': job_id,
+        'resume_text': resume_text,
+        'job_title': job_title,
+        'cache_key': key,
+        'created_at': time.time()
+    })
+    return job_id
+
+
+def read_result(job_id: str, spool_dir: str = OPINION_DIR) -> Dict:
+    """{"status": "pending" | "done" | "failed", "opinion": ...}"""
+    try:
+        with open(os.path.join(spool_dir, f"{job_id}.json"), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'status': 'pending', 'opinion': None}
@@ -0,0 +1,67 @@
+"""Extraction, OCR where needed and analysis in one process.
+
+    python ai/pipeline.py --file resume.pdf --job-title "Data Scientist"
+    python ai/pipeline.py --stdin            (frames, see cli_input.py)
+
+Prints {"status", "text", "extraction", "analysis"} as one JSON object. The
+warm worker answers the same for requests carrying a "file_path".
+"""
+import sys
+import json
+from typing import Dict
+
+from cli_input import InputDocument, read_input
+from pdf_extract import extract_pdf
+
+
+def is_pdf(document: InputDocument) -> bool:
+    return bytes(document.data[:5]) == b'%PDF-'
+
+
+def extract_document(document: InputDocument) -> Dict:
+    """{"text", "seconds", "pages"}: per-page PDF extraction, or the document as UTF-8 text"""
+    if is_pdf(document):
+        with document.as_path() as pdf_path:
+            extracted = extract_pdf(pdf_path)
+        extracted.pop('status', None)
+        return extracted
+    return {'text': document.text().strip(), 'seconds': 0.0, 'pages': []}
+
+
+def run_pipeline(analyzer, document: InputDocument, job_title: str) -> Dict:
+    try:
+        extraction = extract_document(document)
+    except Exception as e:
+        return {'status': 'error', 'error': f"Extraction error: {str(e)}"}
+    finally:
+        document.close()
+
+    text = extraction.pop('text')
+    if not text:
+        return {'status': 'error', 'error': "No text could be extracted", 'extraction': extraction}
+
+    analysis = analyzer.analyze_resume(text, job_title)
+    return {
+        'status': analysis['status'],
+        'text': text,
+        'extraction': extraction,
+        'analysis': analysis
+    }
+
+
+if __name__ == "__main__":
+    try:
+        request = read_input(sys.argv[1:])
+    except (OSError, ValueError, EOFError) as e:
+        print(json.dumps({'status': 'error', 'error': f"Invalid input: {str(e)}"}))
+        sys.exit(1)
+
+    if not request:
+        print(json.dumps({'status': 'error', 'error': "Usage: pipeline.py --file PATH --job-title TITLE | --stdin"}))
+        sys.exit(1)
+
+    from resume_analyser import ResumeAnalyzer
+    document, job_title = request
+    result = run_pipeline(ResumeAnalyzer(), document, job_title)
+    print(json.dumps(result))
+    sys.exit(0 if result['status'] == 'success' else 1)
@@ -0,0 +1,130 @@
+import os
+import re
+from typing import Dict, List
+
+from analysis_context import AnalysisContext
+
+# Upper bound on the resume part of the opinion prompt
+OPINION_TOKEN_BUDGET = int(os.getenv('OPINION_TOKEN_BUDGET', 1200))
+
+# Sections in the order they matter to the reviewer, with their share of the budget
+SECTION_BUDGET_SHARES = (
+    ('summary', 0.15),
+    ('experience', 0.45),
+    ('skills', 0.15),
+    ('projects', 0.15),
+    ('education', 0.10),
+)
+
+# Share of the budget for extracted facts, and the longest single fact kept
+FACTS_BUDGET_SHARE = 0.25
+FACT_MAX_CHARS = 40
+
+_TOKEN_PIECES = re.compile(r"[A-Za-z]+|\d+|[^\w\s]")
+
+
+def count_tokens(text: str) -> int:
+    """Local approximation of a BPE token count.
+
+    Words cost one token per 6 letters (rounded up), digit runs one per 3
+    digits, punctuation one each. It errs on the high side for English,
+    which keeps prompts within budget without a tokenizer dependency.
+    """
+    total = 0
+    for piece in _TOKEN_PIECES.findall(text):
+        if piece[0].isalpha():
+            total += (len(piece) + 5) // 6
+        elif piece[0].isdigit():
+            total += (len(piece) + 2) // 3
+        else:
+            total += 1
+    return total
+
+
+def truncate_to_budget(text: str, budget: int) -> str:
+    """Keeps lines from the start of `text` while they fit in `budget` tokens.
+
+    The first line that does not fit is cut at a word boundary.
+    """
+    kept, used = [], 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        cost = count_tokens(line)
+        if used + cost <= budget:
+            kept.append(line)
+            used += cost
+            continue
+
+        words = []
+        for word in line.split():
+            cost = count_tokens(word)
+            if used + cost > budget:
+                break
+            words.append(word)
+            used += cost
+        if words:
+            kept.append(" ".join(words))
+        break
+    return "\n".join(kept)
+
+
+def excerpt_to_budget(text: str, budget: int) -> str:
+    """truncate_to_budget, or the leading characters when no whole word fits.
+
+    A character never costs more than one token, so the fallback stays
+    within budget even for a single huge token (an OCR digit run).
+    """
+    return truncate_to_budget(text, budget) or text.strip()[:max(0, budget)]
+
+
+def _fact_item(item: str) -> str:
+    return item if len(item) <= FACT_MAX_CHARS else item[:FACT_MAX_CHARS] + "..."
+
+
+def build_opinion_prompt(context: AnalysisContext, feedback: Dict, budget: int = OPINION_TOKEN_BUDGET) -> str:
+    """Bounded-size summary of a resume for the opinion model.
+
+    Extracted facts (metrics, date ranges, quality flags) go first, within
+    FACTS_BUDGET_SHARE of the budget; section text fills the rest in
+    priority order, with any share a short section does not use passed on
+    to the next one. Without usable sections, the start of the text is used.
+    """
+    facts: List[str] = []
+    if feedback.get('metrics_found'):
+        facts.append("Quantified achievements: " + ", ".join(map(_fact_item, feedback['metrics_found'][:15])))
+    if feedback.get('date_ranges_found'):
+        facts.append("Employment dates: " + "; ".join(map(_fact_item, feedback['date_ranges_found'][:10])))
+    if feedback.get('missing_sections'):
+        facts.append("Missing sections: " + ", ".join(feedback['missing_sections']))
+    flagged = [issue.replace('_', ' ') for issue, found in feedback.get('quality_issues', {}).items() if found]
+    if flagged:
+        facts.append("Quality issues flagged: " + ", ".join(flagged))
+
+    facts_text = truncate_to_budget("\n".join(facts), int(budget * FACTS_BUDGET_SHARE))
+    parts = [facts_text] if facts_text else []
+    remaining = budget - count_tokens(facts_text)
+
+    carry = 0
+    has_sections = False
+    for section, share in SECTION_BUDGET_SHARES:
+        body = context.section_text(section).strip()
+        allowance = int(budget * share) + carry
+        if not body:
+            carry = allowance
+            continue
+        header_cost = count_tokens(section)
+        excerpt = excerpt_to_budget(body, min(allowance, remaining) - header_cost)
+        used = count_tokens(excerpt) + header_cost if excerpt else 0
+        if excerpt:
+            parts.append(f"{section.upper()}\n{excerpt}")
+            has_sections = True
+        remaining -= used
+        carry = allowance - used
+
+    if not has_sections:
+        # No recognisable headers, or only empty ones: the start of the resume is the best we have
+        parts.append(excerpt_to_budget(context.text, max(0, remaining)))
+
+    return "\n\n".join(p for p in parts if p) + "\n\n"
@@ -0,0 +1,186 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import sqlite3
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional
+
+import metrics
+
+CACHE_PATH = os.getenv('ANALYSIS_CACHE_PATH', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'storage', 'app', 'cache', 'analysis.sqlite'
+))
+
+
+def cache_key(*parts: str) -> str:
+    """sha256 over NUL-separated parts"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Two-level JSON cache: an in-process LRU in front of a shared SQLite file.
+
+    Each named table is a separate namespace, so analysis results and paid LLM
+    opinions can be invalidated independently. The disk layer expires entries
+    after `ttl` seconds and evicts least recently used rows once the table is
+    over `max_bytes`.
+    """
+
+    def __init__(self, table: str, path: str = CACHE_PATH, memory_entries: int = 256,
+                 max_bytes: int = 256 * 1024 * 1024, ttl: float = 30 * 24 * 3600):
+        self.table = table
+        self.path = path
+        self.memory = OrderedDict()
+        self.memory_entries = memory_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.connection = None
+        self.puts_since_evict = 0
+        self.counters = {
+            'memory_hits': 0, 'disk_hits': 0, 'misses': 0,
+            'evictions': 0, 'expirations': 0, 'errors': 0
+        }
+
+    def _db(self) -> sqlite3.Connection:
+        # Opened on first use so forked workers never share a connection
+        if self.connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(f"""
+                CREATE TABLE IF NOT EXISTS {self.table} (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )""")
+            self.connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table} (accessed_at)"
+            )
+        return self.connection
+
+    def _remember(self, key: str, value: str):
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict]:
+        """{key: value} of the keys that are cached, with one disk query for the rest"""
+        found = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            value = self.memory.get(key)
+            if value is None:
+                missing.append(key)
+                continue
+            self.memory.move_to_end(key)
+            self.counters['memory_hits'] += 1
+            metrics.inc('cache_lookups_total', cache=self.table, result='memory_hit')
+            found[key] = json.loads(value)
+
+        if missing:
+            try:
+                db = self._db()
+                placeholders = ','.join('?' * len(missing))
+                rows = db.execute(
+                    f"SELECT key, value, created_at FROM {self.table} WHERE key IN ({placeholders})", missing
+                ).fetchall()
+                now = time.time()
+                expired = [key for key, _, created_at in rows if now - created_at > self.ttl]
+                hits = [(key, value) for key, value, created_at in rows if now - created_at <= self.ttl]
+                with self._transaction(db):
+                    db.executemany(f"DELETE FROM {self.table} WHERE key = ?", [(key,) for key in expired])
+                    db.executemany(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+                                   [(now, key) for key, _ in hits])
+                self.counters['expirations'] += len(expired)
+                for key, value in hits:
+                    self.counters['disk_hits'] += 1
+                    metrics.inc('cache_lookups_total', cache=self.table, result='disk_hit')
+                    self._remember(key, value)
+                    found[key] = json.loads(value)
+            except sqlite3.Error as e:
+                self.counters['errors'] += 1
+                print(f"Cache read failed: {e}", file=sys.stderr)
+
+        for key in missing:
+            if key not in found:
+                self.counters['misses'] += 1
+                metrics.inc('cache_lookups_total', cache=self.table, result='miss')
+        return found
+
+    def put(self, key: str, value: Dict):
+        self.put_many({key: value})
+
+    def put_many(self, items: Dict[str, Dict]):
+        """Stores several entries in one disk transaction"""
+        if not items:
+            return
+        encoded = {key: json.dumps(value) for key, value in items.items()}
+        for key, value in encoded.items():
+            self._remember(key, value)
+
+        try:
+            now = time.time()
+            db = self._db()
+            with self._transaction(db):
+                db.executemany(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, size, created_at, accessed_at) "
+                    f"VALUES (?, ?, ?, ?, ?)",
+                    [(key, value, len(value), now, now) for key, value in encoded.items()]
+                )
+            self.puts_since_evict += len(encoded)
+            if self.puts_since_evict >= 50:
+                self.evict()
+        except sqlite3.Error as e:
+            self.counters['errors'] += 1
+            print(f"Cache write failed: {e}", file=sys.stderr)
+
+    @staticmethod
+    @contextmanager
+    def _transaction(db: sqlite3.Connection) -> Iterator[None]:
+        # The connection autocommits; group statements so they share one commit
+        db.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def evict(self):
+        """Drops expired rows, then least recently used rows until under max_bytes"""
+        self.puts_since_evict = 0
+        db = self._db()
+        expired = db.execute(f"DELETE FROM {self.table} WHERE created_at < ?", (time.time() - self.ttl,))
+        self.counters['expirations'] += expired.rowcount
+
+        total = db.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for key, size in db.execute(f"SELECT key, size FROM {self.table} ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            db.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self.memory.pop(key, None)
+            total -= size
+            evicted += 1
+        self.counters['evictions'] += evicted
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.counters['memory_hits'] + self.counters['disk_hits'] + self.counters['misses']
+        hits = self.counters['memory_hits'] + self.counters['disk_hits']
+        return dict(self.counters, hit_ratio=round(hits / lookups, 3) if lookups else 0.0)
@@ -1,33 +1,99 @@
+import os
 import sys
+import time
 import json
 import re
 import base64
-from typing import Dict, List, Tuple
-import spacy
-import mysql.connector
-from collections import defaultdict
-from groq import Groq
+from typing import Dict, List, Optional, Tuple
+from action_verbs import ACTION_VERBS, get_verb_matcher
+from analysis_context import TOKEN_PATTERN, AnalysisContext
+from title_index import TitleIndex
+from db import get_database
+from result_cache import ResultCache, cache_key
+from metric_extractor import KINDS as METRIC_KINDS, METRIC_MAX_INPUT_CHARS, METRIC_MAX_MATCHES, find_metrics
+from prompt import build_opinion_prompt
+import opinion_spool
+from section_detector import get_section_detector
+from text_cleaner import clean_text
+from title_learner import TitleLearner
+from timings import stage, timed
+import metrics
+
+# Part of every result cache key: bump whenever scoring or feedback rules
+# change so cached results are recomputed
+ANALYSER_VERSION = "8"
+
+# After a failed title index load (database down, missing table, bad query),
+# requests use the empty index until this many seconds have passed
+TITLE_INDEX_RETRY_SECONDS = float(os.getenv('TITLE_INDEX_RETRY_SECONDS', 30))
+
+# Sections where first-person pronouns are expected
+PRONOUN_SECTIONS = {'summary', 'profile'}
+
+# spaCy, numpy/scipy and mysql.connector are imported on first use so a
+# single-shot run that matches the title exactly never pays for them.
+_nlp = None
+_title_vectorizer_class = None
+
+
+def get_nlp():
+    """Loads the spaCy model on first use, with only what .similarity() needs"""
+    global _nlp
+    if _nlp is None:
+        import spacy
+        _nlp = spacy.load(
+            "en_core_web_sm",
+            exclude=["parser", "ner", "lemmatizer", "attribute_ruler", "senter"]
+        )
+    return _nlp
+
+
+def get_title_vectorizer_class():
+    """TitleVectorizer, or None when numpy/scipy are not installed"""
+    global _title_vectorizer_class
+    if _title_vectorizer_class is None:
+        try:
+            from title_vectors import TitleVectorizer
+            _title_vectorizer_class = TitleVectorizer
+        except ImportError:  # fall back to spaCy similarity
+            _title_vectorizer_class = False
+    return _title_vectorizer_class or None
 
-nlp = spacy.load("en_core_web_sm")
 
 class ResumeAnalyzer:
-    def __init__(self):
+    @staticmethod
+    def preload():
+        """Imports the heavy dependencies up front (before forking workers)"""
+        if get_title_vectorizer_class() is None:
+            get_nlp()
+        try:
+            import mysql.connector
+        except ImportError:  # SQLite-only deployment
+            pass
+
+    def __init__(self, ai_opinion: bool = True, title_refresh_interval: float = 0, cache: bool = True,
+                 learn_titles: bool = True):
         # Initialisations
+        self.ai_opinion_enabled = ai_opinion
+        self.result_cache = ResultCache('analysis_results') if cache else None
+        # Per-section features, so a re-upload only re-scans the sections that were edited
+        self.section_cache = ResultCache('section_features', memory_entries=2048) if cache else None
+        self.opinion_cache = None
         self._compile_patterns()
-        self.job_title_db = self._init_db_connection()
-        self.learned_titles = defaultdict(int) 
+        # Pooled and lazy: nothing connects until a title is first looked up
+        self.db = get_database()
+        self._title_index = None
+        self.title_index_loaded = False
+        self.title_index_retry_at = 0.0
+        self.title_refresh_interval = title_refresh_interval
+        self.title_vectorizer = None
+        # Unknown titles are counted in memory and written behind the request
+        self.title_learner = TitleLearner(self.db, on_promote=self._on_title_promoted) if learn_titles else None
         
     def _compile_patterns(self):
         """Pre-compiled regex patterns used in analysis"""
-        self.section_pattern = re.compile(
-            r'^(contact|summary|experience|education|skills|projects)\s*:?$',
-            re.I | re.M
-        )
-        
-        self.metric_pattern = re.compile(
-            r'(?:\$\d[\d,]+|\d+\s*%|\d+\s*x|\d+\s*\+|\d+\s*years?|\b\d{3,}\b|\d+\s*[\w/]+\b|\d+\+?)',
-            re.I
-        )
+        # Headers and header-less section keywords, found in one scan
+        self.section_detector = get_section_detector()
         
         self.quality_patterns = {
             'generic_phrases': re.compile(
@@ -37,7 +103,7 @@ class ResumeAnalyzer:
             'pronouns': re.compile(r'\bI\b|\bmy\b|\bme\b'),
             'passive_voice': re.compile(r'\bwas\s+\w+ed\b|\bwere\s+\w+ed\b|\bby\s+the\b', re.I)
         }
-        
+
         self.date_range_pattern = re.compile(
             r'(?:(?:Jan|Feb|Mar|April|May|June|July|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4})'
             r'\s*[-–—]\s*'
@@ -53,6 +119,16 @@ class ResumeAnalyzer:
         return "Weak"
 
     def analyze_resume(self, resume_text: str, job_title: str) -> Dict:
+        started = time.perf_counter()
+        with timed() as timings:
+            result = self._analyze(resume_text, job_title)
+        metrics.observe('analyser_request_seconds', time.perf_counter() - started)
+        if timings is not None:
+            # Never cached: timings describe this request only
+            result['timings'] = timings.as_dict()
+        return result
+
+    def _analyze(self, resume_text: str, job_title: str) -> Dict:
         try:
             # 1. input validation
             if not resume_text or not isinstance(resume_text, str):
@@ -62,44 +138,71 @@ class ResumeAnalyzer:
                 return self._error_response("Invalid job title")
 
             # 2. Clean inputs
-            clean_text = self._clean_text(resume_text)
-            standardized_title = self._standardize_title(job_title)
-
-            # 3. Calculate content score
-            content_result = self._analyze_resume_content(clean_text)
-            if not isinstance(content_result.get('score'), (int, float)):
-                return self._error_response("Invalid content analysis")
-
-            # 4. Calculate title match (0-1 scale)
-            title_match = self._calculate_title_match(clean_text, standardized_title)
-            if not isinstance(title_match, (int, float)) or not 0 <= title_match <= 1:
-                return self._error_response("Invalid title match calculation")
-
-            # 5. Combine scores (70% content, 30% title)
-            final_score = (content_result['score'] * 0.7) + (title_match * 100 * 0.3)
-
-            # If title match is less or equal to 0.6, divide the final score by 2 to penelise it
-            if title_match <= 0.6:
-                final_score /= 2
-
-            self.final_score = final_score
-
-            # 6. Prepare output with debug info
-            return {
-                'status': 'success',
-                'score': min(100, max(0, final_score)),  
-                'score_breakdown': {
-                    'content_score': content_result['score'],
-                    'title_match_score': round(title_match * 100, 1),
-                    'title_match_strength': self._get_match_strength(title_match)
-                },
-                'feedback': content_result.get('feedback', {})
-            }
+            with stage('clean_text'):
+                clean_text = self._clean_text(resume_text)
+            with stage('standardize_title'):
+                standardized_title = self._standardize_title(job_title)
+                self._learn_job_title(standardized_title)
+
+            # 3. Re-uploads of the same CV for the same title are served from cache
+            key = cache_key(ANALYSER_VERSION, clean_text, standardized_title)
+            with stage('cache_lookup'):
+                result = self.result_cache.get(key) if self.result_cache else None
+            if result is None:
+                with stage('score'):
+                    result = self._score_resume(clean_text, standardized_title)
+                if self.result_cache and result['status'] == 'success':
+                    with stage('cache_store'):
+                        # Served again only for an identical upload, where no section changed
+                        self.result_cache.put(key, dict(result, changed_sections=[]))
+
+            if result['status'] == 'success':
+                with stage('attach_opinion'):
+                    self._attach_opinion(result, clean_text, standardized_title, job_title)
+            return result
 
         except Exception as e:
             return self._error_response(f"Analysis error: {str(e)}")
 
-    def _calculate_title_match(self, resume_text: str, job_title: str) -> float:
+    def _score_resume(self, clean_text: str, standardized_title: str) -> Dict:
+        """Content and title scoring of an already cleaned resume"""
+        # 1. Calculate content score
+        with stage('build_context'):
+            context = self._build_context(clean_text)
+        content_result = self._analyze_resume_content(context)
+        if not isinstance(content_result.get('score'), (int, float)):
+            return self._error_response("Invalid content analysis")
+
+        # 2. Calculate title match (0-1 scale)
+        with stage('title_match'):
+            title_match = self._calculate_title_match(context, standardized_title)
+        if not isinstance(title_match, (int, float)) or not 0 <= title_match <= 1:
+            return self._error_response("Invalid title match calculation")
+
+        # 3. Combine scores (70% content, 30% title)
+        final_score = (content_result['score'] * 0.7) + (title_match * 100 * 0.3)
+
+        # If title match is less or equal to 0.6, divide the final score by 2 to penelise it
+        if title_match <= 0.6:
+            final_score /= 2
+
+        self.final_score = final_score
+
+        # 4. Prepare output with debug info
+        return {
+            'status': 'success',
+            'score': min(100, max(0, final_score)),  
+            'score_breakdown': {
+                'content_score': content_result['score'],
+                'title_match_score': round(title_match * 100, 1),
+                'title_match_strength': self._get_match_strength(title_match)
+            },
+            'feedback': content_result.get('feedback', {}),
+            # Sections not seen in an earlier upload, whose features were computed afresh
+            'changed_sections': context.changed_sections
+        }
+
+    def _calculate_title_match(self, context: AnalysisContext, job_title: str) -> float:
         """Simplified title matching that searches entire resume"""
         try:
             # Standardize the input title
@@ -108,12 +211,13 @@ class ResumeAnalyzer:
                 return 0.4 
             
             # Search for direct matches
-            if standardized_input.lower() in resume_text.lower():
+            title_lower = standardized_input.lower()
+            resume_lower = context.lower
+            if title_lower in resume_lower:
                 return 1.0 
             
             # Search for partial matches
-            input_words = standardized_input.lower().split()
-            resume_lower = resume_text.lower()
+            input_words = title_lower.split()
             
             # Count how many title words appear in resume
             matches = sum(1 for word in input_words if word in resume_lower)
@@ -124,107 +228,98 @@ class ResumeAnalyzer:
             if match_ratio >= 0.7: return 0.9    # Most words match
             if match_ratio >= 0.5: return 0.7    # Some words match
             
-            # Fallback to NLP similarity if no direct matches
-            input_doc = nlp(standardized_input.lower())
-            resume_doc = nlp(resume_text.lower())
-            nlp_similarity = input_doc.similarity(resume_doc)
+            # Fallback to vector similarity if no direct matches
+            if get_title_vectorizer_class() is not None:
+                metrics.inc('title_match_fallback_total', method='vector')
+                with stage('title_similarity'):
+                    similarity = self._title_similarity(context, title_lower)
+            else:
+                metrics.inc('title_match_fallback_total', method='spacy')
+                with stage('spacy_similarity'):
+                    nlp = get_nlp()
+                    input_doc = nlp(title_lower)
+                    resume_doc = nlp(resume_lower)
+                    similarity = input_doc.similarity(resume_doc)
             
-            return max(nlp_similarity, 0.2)  #penelise
+            return min(1.0, max(similarity, 0.2))  #penelise
         
         except Exception as e:
             print(f"Title matching error: {str(e)}", file=sys.stderr)
             return 0.2  
 
-    def _standardize_title(self, title: str) -> str:
-        """Simplified title standardization"""
-        if not title or not isinstance(title, str):
-            return ""
-        
-        # Basic cleaning
-        title = title.lower().strip()
-        title = re.sub(r'[^a-z0-9\s]', '', title)  #
-        
-        # Common replacements
-        replacements = {
-            r'\bweb\s*dev\b': 'web developer',
-            r'\bsoft(?:ware)?\s*eng(?:ineer)?\b': 'software engineer',
-            r'\bdata\s*sci(?:entist)?\b': 'data scientist',
-            r'\bfront\s*end\b': 'frontend developer',
-            r'\bback\s*end\b': 'backend developer'
-        }
-        
-        for pattern, repl in replacements.items():
-            title = re.sub(pattern, repl, title)
-        
-        return title
-
     def _learn_job_title(self, title: str):
-        """Store new job titles and track frequency"""
-        if not self._title_exists(title):
-            self.learned_titles[title] += 1
-            # Auto-add to DB after seeing title 3 times
-            if self.learned_titles[title] >= 3:
-                self._add_to_standardized_titles(title)
-
-    def _add_to_standardized_titles(self, title: str):
-        """Add new title to database"""
-        try:
-            cursor = self.job_title_db.cursor()
-            query = """INSERT INTO standardised_job_titles 
-                      (original_title, standardised_title) 
-                      VALUES (%s, %s)"""
-            cursor.execute(query, (title, title))
-            self.job_title_db.commit()
-        except Exception as e:
-            print(f"Failed to add title: {e}", file=sys.stderr)
+        """Track how often unknown job titles are requested"""
+        # Without the loaded index every title would look new
+        if not self.title_learner or not title or not self.title_index_loaded:
+            return
+        if self.title_index.lookup(title) is None:
+            self.title_learner.record(title)
+
+    def _on_title_promoted(self, title: str):
+        """Promoted titles are matched exactly from the next request on"""
+        if self._title_index is not None:
+            self._title_index.add(title, title)
 
     def _title_exists(self, title: str) -> bool:
-        """Check if title exists in database"""
-        cursor = self.job_title_db.cursor()
-        query = """SELECT 1 FROM standardised_job_titles 
-                  WHERE standardised_title = %s LIMIT 1"""
-        cursor.execute(query, (title,))
-        return cursor.fetchone() is not None
-    
-    def _init_db_connection(self):
-        """Initialize MySQL connection"""
-        return mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",
-            database="ats_blitz"
-        )
+        """Check if title exists, in memory when the title index is loaded"""
+        if self.title_index.lookup(title) is not None:
+            return True
+        if self.title_index_loaded:
+            return False
+        rows = self.db.query('title_exists', (title,))
+        return bool(rows)
+
+    @property
+    def title_index(self) -> TitleIndex:
+        """standardised_job_titles in memory, loaded on first use"""
+        if self._title_index is None:
+            self._title_index = TitleIndex()
+        if not self.title_index_loaded and time.monotonic() >= self.title_index_retry_at:
+            if self._title_index.refresh(self.db) is not None:
+                self.title_index_loaded = True
+                if self.title_refresh_interval > 0:
+                    self._title_index.start_auto_refresh(self.db, self.title_refresh_interval)
+            else:
+                # Any failure, not just a lost connection, would otherwise be retried every call
+                self.title_index_retry_at = time.monotonic() + TITLE_INDEX_RETRY_SECONDS
+        return self._title_index
+
+    def load_title_index(self) -> bool:
+        """Loads the title index now (worker start-up) instead of in the first request"""
+        return self.title_index is not None and self.title_index_loaded
         
-    def _find_section_bounds(self, text: str) -> Dict[str, Tuple[int, int]]:
+    def _build_context(self, clean_text: str) -> AnalysisContext:
+        """Scans the cleaned text once for every later stage"""
+        return AnalysisContext(clean_text, self.section_detector)
+
+    def _find_section_bounds(self, context: AnalysisContext) -> Dict[str, Tuple[int, int]]:
         """Returns {section_name: (start_index, end_index)}"""
-        bounds = {}
-        matches = list(self.section_pattern.finditer(text))
-        
-        for i, match in enumerate(matches):
-            section = match.group(1).lower()
-            start = match.end()
-            end = matches[i+1].start() if i+1 < len(matches) else len(text)
-            bounds[section] = (start, end)
-        
-        return bounds
+        return context.section_bounds
     
-    def _analyze_resume_content(self, clean_text: str) -> Dict:
+    def _analyze_resume_content(self, context: AnalysisContext) -> Dict:
         """Core analysis of resume content that was previously missing"""
+        clean_text = context.text
+
         # Find all sections in the resume
-        section_bounds = self._find_section_bounds(clean_text)
-        sections = self._detect_sections(clean_text)
-        
-        # Extract key components
-        metrics = self._find_metrics(clean_text)
-        action_verbs = [verb for verb in self._load_action_verbs() if verb in clean_text.lower()]
-        quality_issues = self._check_quality(clean_text, section_bounds)
-        date_ranges = self._find_date_ranges(clean_text)
+        with stage('detect_sections'):
+            section_bounds = self._find_section_bounds(context)
+            sections = self._detect_sections(context)
+        
+        # Extract key components, reusing the results of unchanged sections
+        with stage('section_features'):
+            self._section_features(context)
+        metrics = self._find_metrics(context)
+        verb_hits = self._find_action_verbs(context)
+        action_verbs = list(verb_hits)
+        quality_issues = self._check_quality(context)
+        date_ranges = self._find_date_ranges(context)
         
         # Calculate score
         score = self._calculate_score(
             sections=sections,
             metrics=metrics,
             action_verbs=action_verbs,
+            verb_hits=verb_hits,
             text=clean_text,
             quality_issues=quality_issues,
             date_ranges=date_ranges
@@ -236,7 +331,9 @@ class ResumeAnalyzer:
             sections=sections,
             metrics=metrics,
             action_verbs=action_verbs,
+            verb_hits=verb_hits,
             text=clean_text,
+            context=context,
             quality_issues=quality_issues,
             date_ranges=date_ranges,
             section_bounds=section_bounds
@@ -264,54 +361,42 @@ class ResumeAnalyzer:
         
         return feedback
 
-    def _detect_sections(self, text: str) -> Dict[str, bool]:
-        sections = {
-            'contact': False,
-            'summary': False,
-            'experience': False,
-            'education': False,
-            'skills': False,
-            'projects': False
-        }
-        
-        # Check for explicit section headers
-        found_headers = set(
-            header.lower() for header in 
-            self.section_pattern.findall(text)
-        )
-        
-        # Update sections based on found headers
-        for section in sections:
-            if section in found_headers:
-                sections[section] = True
-            else:
-                # Fallback
-                sections[section] = bool(re.search(
-                    self._get_section_keywords(section), 
-                    text, 
-                    re.I
-                ))
-        
-        return sections
+    def _detect_sections(self, context: AnalysisContext) -> Dict[str, bool]:
+        """Sections with a header, or with keyword evidence when the header is missing"""
+        return dict(context.section_flags)
     
     def _clean_text(self, text: str) -> str:
-        """Cleans and standardizes resume text for analysis"""
-        # Remove non-ASCII characters
-        text = text.encode('ascii', errors='ignore').decode('ascii')
-        
-        # Normalise whitespace and line breaks
-        text = ' '.join(text.split())
-        
-        # Remove common resume artifacts
-        text = re.sub(r'•|\u2022|\u25E6|\u25AA', ' ', text)  # Bullet points
-        text = re.sub(r'\bpage\s*\d+\b', '', text, flags=re.I)  # Page numbers
-        text = re.sub(r'http[s]?://\S+', '', text)  # URLs
-        
-        # Standardise section headers
-        text = re.sub(r'\n\s*([A-Z][A-Z\s]+)\s*\n', r'\n\1\n', text)
-        
-        return text.strip()
+        """Cleans and standardizes resume text for analysis, keeping line breaks for section headers"""
+        return clean_text(text)
     
+    def _get_title_vectorizer(self):
+        """TF-IDF matrix over the title index, rebuilt only when the index grows"""
+        if self.title_vectorizer is None or self.title_vectorizer_size != len(self.title_index):
+            # The refresh thread and promotions add titles concurrently
+            with self.title_index.lock:
+                titles = list(self.title_index.exact.values())
+                self.title_vectorizer_size = len(self.title_index)
+            self.title_vectorizer = get_title_vectorizer_class()(titles)
+        return self.title_vectorizer
+
+    def _title_similarity(self, context: AnalysisContext, title: str) -> float:
+        """Best cosine similarity between the title and a summary/experience sentence"""
+        spans = [
+            context.section_bounds[section]
+            for section in ('summary', 'experience')
+            if section in context.section_bounds
+        ] or [(0, len(context.text))]
+
+        sentences = [
+            context.text[max(start, span_start):min(end, span_end)]
+            for start, end in context.sentences
+            for span_start, span_end in spans
+            if start < span_end and end > span_start
+        ]
+
+        vectorizer = self._get_title_vectorizer()
+        return vectorizer.similarity(vectorizer.transform(sentences), title)
+
     def _standardize_title(self, title: str) -> str:
         """Standardises job titles for consistent matching"""
         if not title or not isinstance(title, str):
@@ -338,152 +423,118 @@ class ResumeAnalyzer:
         # Remove common prefixes/suffixes
         title = re.sub(r'^(senior|junior|lead|principal)\s+', '', title)
         title = re.sub(r'\s+(i|ii|iii|iv|v)$', '', title)
+
+        # Prefer the catalogue spelling when the title (or a close typo) is known
+        known_title = self.title_index.resolve(title)
+        if known_title:
+            return known_title
         
         return title.title() 
 
-    def _get_section_keywords(self, section: str) -> str:
-        """Returns regex pattern for section content detection"""
-        keywords = {
-            'contact': r'contact|info|details|email|phone|address|linkedin',
-            'summary': r'summary|objective|profile|about me',
-            'experience': r'experience|work\s*history|employment',
-            'education': r'education|academic|degree|university',
-            'skills': r'skills|proficient|competencies|expertise',
-            'projects': r'projects|portfolio|case\s*studies'
+    def _load_action_verbs(self) -> List[str]:
+        """Returns the deduplicated action verb list"""
+        return list(ACTION_VERBS)
+
+    def _section_features(self, context: AnalysisContext) -> Dict:
+        """Verbs, metrics, quality hits and date ranges of the whole text.
+
+        Each segment's features are cached under a hash of its text, so only
+        segments that differ from earlier uploads are scanned; the rest are
+        merged from the cache. Computed once per context.
+        """
+        if context.features is not None:
+            return context.features
+
+        segments = context.segments
+        keys = [self._segment_key(context, *segment[1:]) for segment in segments]
+        cached = self.section_cache.get_many(keys) if self.section_cache else {}
+
+        features = {'verbs': {}, 'metrics': [], 'generic_phrases': False, 'passive_voice': False,
+                    'pronouns': False, 'date_ranges': []}
+        computed = {}
+        changed = []
+        for (section, start, body_start, end), key in zip(segments, keys):
+            segment = cached.get(key) or computed.get(key)
+            if segment is None:
+                segment = computed[key] = self._segment_features(context, start, body_start, end)
+                changed.append(section)
+
+            for verb, offsets in segment['verbs'].items():
+                features['verbs'].setdefault(verb, []).extend(start + offset for offset in offsets)
+            features['metrics'].extend(segment['metrics'])
+            features['generic_phrases'] |= segment['generic_phrases']
+            features['passive_voice'] |= segment['passive_voice']
+            # Pronouns are checked in the section_bounds span of each section
+            if (section not in PRONOUN_SECTIONS
+                    and context.section_bounds.get(section) == (body_start, end)):
+                features['pronouns'] |= segment['pronouns']
+            features['date_ranges'].extend(segment['date_ranges'])
+        del features['metrics'][METRIC_MAX_MATCHES:]
+
+        if computed and self.section_cache:
+            self.section_cache.put_many(computed)
+        context.features = features
+        context.changed_sections = list(dict.fromkeys(changed))
+        return features
+
+    @staticmethod
+    def _segment_key(context: AnalysisContext, start: int, body_start: int, end: int) -> str:
+        # The metric cap depends on where the segment starts, so it is part of the key
+        metric_chars = max(0, min(end, METRIC_MAX_INPUT_CHARS) - start)
+        return cache_key(ANALYSER_VERSION, str(body_start - start), str(metric_chars), context.text[start:end])
+
+    def _segment_features(self, context: AnalysisContext, start: int, body_start: int, end: int) -> Dict:
+        """Features of text[start:end], with offsets relative to start"""
+        return {
+            'verbs': self._segment_verbs(context, start, end),
+            'metrics': self._segment_metrics(context, start, end),
+            **self._segment_quality(context, start, body_start, end),
+            'date_ranges': self.date_range_pattern.findall(context.text[start:end]),
         }
-        return keywords.get(section, '')
-    
 
-    def _load_action_verbs(self) -> List[str]:
-        """Returns categorized action verbs with strength indicators"""
-        return [
-        # Leadership & Management  
-        'managed', 'led', 'increased', 'reduced', 'achieved', 'developed',  
-        'supervised', 'directed', 'coordinated', 'oversaw', 'spearheaded', 'delegated',  
-        'organised', 'executed', 'administered', 'facilitated', 'guided', 'chaired',  
-        'orchestrated', 'motivated', 'empowered', 'influenced', 'transformed', 'streamlined',  
-        
-        # Problem-Solving & Analytical  
-        'resolved', 'diagnosed', 'investigated', 'analszed', 'evaluated', 'assessed',  
-        'identified', 'interpreted', 'synthesised', 'formulated', 'conceptualised', 'devised',  
-        'designed', 'troubleshot', 'improved', 'optimised', 'innovated', 'calculated',  
-        'forecasted', 'critiqued',  
-        
-        # Communication & Interpersonal  
-        'presented', 'negotiated', 'persuaded', 'advised', 'consulted', 'counseled',  
-        'communicated', 'trained', 'educated', 'instructed', 'explained', 'facilitated',  
-        'mediated', 'promoted', 'drafted', 'wrote', 'edited', 'proofread', 'published',  
-        'corresponded',  
-        
-        # Technical & IT  
-        'developed', 'programmed', 'engineered', 'implemented', 'built', 'designed',  
-        'debugged', 'tested', 'automated', 'integrated', 'configured', 'optimised',  
-        'maintained', 'updated', 'secured', 'installed', 'networked', 'deployed',  
-        'customised', 'coded',  
-        
-        # Sales & Marketing  
-        'sold', 'marketed', 'promoted', 'advertised', 'pitched', 'negotiated',  
-        'closed', 'converted', 'generated', 'captured', 'expanded', 'achieved',  
-        'maximised', 'upsold', 'strategized', 'launched', 'branded', 'targeted',  
-        'forecasted',  
-        
-        # Finance & Accounting  
-        'audited', 'budgeted', 'forecasted', 'analyzed', 'calculated', 'reduced',  
-        'allocated', 'balanced', 'estimated', 'reconciled', 'managed', 'reported',  
-        'controlled', 'projected', 'processed', 'secured', 'evaluated', 'invested',  
-        'costed', 'maximised',  
-        
-        # Customer Service & Client Relations  
-        'assisted', 'supported', 'served', 'resolved', 'advised', 'responded',  
-        'addressed', 'improved', 'handled', 'engaged', 'retained', 'upsold',  
-        'followed-up', 'welcomed', 'listened', 'recommended', 'satisfied', 'maintained',  
-        'advocated', 'collaborated',  
-        
-        # Teaching & Training  
-        'taught', 'instructed', 'educated', 'trained', 'coached', 'mentored',  
-        'guided', 'facilitated', 'explained', 'demonstrated', 'designed', 'conducted',  
-        'developed', 'adapted', 'assessed', 'evaluated', 'encouraged', 'inspired',  
-        'illustrated', 'moderated',  
-        
-        # Creative & Design  
-        'created', 'designed', 'conceptualised', 'illustrated', 'photographed',  
-        'sketched', 'drafted', 'produced', 'edited', 'directed', 'styled',  
-        'innovated', 'transformed', 'crafted', 'painted', 'filmed', 'animated',  
-        'composed', 'curated', 'visualized',  
-        
-        # Medical & Healthcare  
-        'diagnosed', 'treated', 'examined', 'prescribed', 'assisted', 'administered',  
-        'monitored', 'evaluated', 'rehabilitated', 'operated', 'conducted', 'educated',  
-        'supported', 'coordinated', 'advocated', 'responded', 'recorded', 'managed',  
-        'intervened', 'researched',  
-        
-        # Research & Development  
-        'researched', 'investigated', 'analysed', 'examined', 'identified', 'tested',  
-        'formulated', 'developed', 'designed', 'evaluated', 'interpreted', 'experimented',  
-        'documented', 'validated', 'conceptualised', 'innovated', 'discovered', 'compiled',  
-        'compared', 'assessed',  
-        
-        # Operations & Logistics  
-        'coordinated', 'scheduled', 'managed', 'organised', 'optimised', 'facilitated',  
-        'streamlined', 'arranged', 'oversaw', 'allocated', 'dispatched', 'supervised',  
-        'maintained', 'evaluated', 'implemented', 'standardized', 'delivered',  
-        'transported', 'monitored', 'executed',  
-        
-        # Legal & Compliance  
-        'advised', 'negotiated', 'drafted', 'reviewed', 'litigated', 'advocated',  
-        'researched', 'analyzed', 'argued', 'assessed', 'interpreted', 'complied',  
-        'mediated', 'counseled', 'documented', 'defended', 'filed', 'enforced',  
-        'audited', 'arbitrated',  
-        
-        # Engineering & Manufacturing  
-        'engineered', 'designed', 'built', 'manufactured', 'fabricated', 'constructed',  
-        'installed', 'assembled', 'tested', 'developed', 'modeled', 'configured',  
-        'programmed', 'optimised', 'automated', 'operated', 'improved', 'resolved',  
-        'upgraded', 'evaluated',  
-        
-        # Human Resources  
-        'recruited', 'interviewed', 'hired', 'trained', 'assessed', 'managed',  
-        'coordinated', 'facilitated', 'developed', 'conducted', 'resolved',  
-        'implemented', 'mediated', 'supported', 'negotiated', 'consulted', 'motivated',  
-        'retained', 'advised', 'promoted',  
-        
-        # Environmental & Sustainability  
-        'conserved', 'restored', 'monitored', 'evaluated', 'managed', 'implemented',  
-        'reduced', 'designed', 'researched', 'developed', 'innovated', 'coordinated',  
-        'protected', 'educated', 'audited', 'certified', 'advocated', 'measured',  
-        'enhanced', 'enforced'   
-        ]
+    def _segment_verbs(self, context: AnalysisContext, start: int, end: int) -> Dict[str, List[int]]:
+        tokens = ((m.group(), m.start(), m.end()) for m in TOKEN_PATTERN.finditer(context.lower[start:end]))
+        return get_verb_matcher().match_tokens(tokens)
 
-    def _find_metrics(self, text: str) -> List[str]:
-        """Enhanced metric extraction with validation"""
-        return [
-            metric for metric in 
-            self.metric_pattern.findall(text)
-            if len(metric) > 2  # Filter out small numbers
-        ]
+    def _segment_metrics(self, context: AnalysisContext, start: int, end: int) -> List[Tuple[str, str]]:
+        metric_chars = max(0, min(end, METRIC_MAX_INPUT_CHARS) - start)
+        return find_metrics(context.text[start:end], max_chars=metric_chars) if metric_chars else []
 
-    def _check_quality(self, text: str, section_bounds: Dict[str, Tuple[int, int]]) -> Dict[str, bool]:
-        """Detects common resume quality issues with section awareness"""
-        quality_checks = {
+    def _segment_quality(self, context: AnalysisContext, start: int, body_start: int, end: int) -> Dict[str, bool]:
+        text = context.text[start:end]
+        return {
             'generic_phrases': bool(self.quality_patterns['generic_phrases'].search(text)),
             'passive_voice': bool(self.quality_patterns['passive_voice'].search(text)),
-            'pronouns': False  # Initialize as False
+            'pronouns': bool(self.quality_patterns['pronouns'].search(text[body_start - start:])),
         }
-        
-        # Section-aware pronoun check
-        allowed_sections = {'summary', 'profile'}
-        for section, (start, end) in section_bounds.items():
-            if section not in allowed_sections:
-                section_text = text[start:end]
-                if self.quality_patterns['pronouns'].search(section_text):
-                    quality_checks['pronouns'] = True
-                    break
-        
-        return quality_checks
 
-    def _find_date_ranges(self, text: str) -> List[str]:
+    def _find_action_verbs(self, context: AnalysisContext) -> Dict[str, List[int]]:
+        """Returns {verb: [offsets]} for whole-word action verbs"""
+        return self._section_features(context)['verbs']
+
+    def _find_metrics(self, context: AnalysisContext) -> List[str]:
+        """Money, percentages, multipliers, durations and counts, in order of appearance"""
+        return [metric for _, metric in self._section_features(context)['metrics']]
+
+    def _count_metric_kinds(self, context: AnalysisContext) -> Dict[str, int]:
+        """{kind: number of metrics} for every metric kind"""
+        counts = dict.fromkeys(METRIC_KINDS, 0)
+        for kind, _ in self._section_features(context)['metrics']:
+            counts[kind] += 1
+        return counts
+
+    def _check_quality(self, context: AnalysisContext) -> Dict[str, bool]:
+        """Detects common resume quality issues; pronouns only outside the summary"""
+        features = self._section_features(context)
+        return {
+            'generic_phrases': features['generic_phrases'],
+            'passive_voice': features['passive_voice'],
+            'pronouns': features['pronouns']
+        }
+
+    def _find_date_ranges(self, context: AnalysisContext) -> List[str]:
         """Extracts employment date ranges"""
-        return self.date_range_pattern.findall(text)
+        return self._section_features(context)['date_ranges']
 
     def _calculate_score(self, **kwargs) -> int:
         sections = kwargs['sections']
@@ -506,7 +557,7 @@ class ResumeAnalyzer:
         metrics_score = min(15, len(metrics) * 2)
         
         # Action verb scoring (max 20)
-        verbs_found = sum(1 for verb in action_verbs if verb in text)
+        verbs_found = len(action_verbs)
         verbs_score = min(20, verbs_found * 2)
         
         # Quality scoring (max 15)
@@ -546,17 +597,20 @@ class ResumeAnalyzer:
             'score_breakdown': {
                 'sections': sum(1 for v in sections.values() if v) * 10,
                 'metrics': len(metrics) * 2,
-                'action_verbs': sum(1 for verb in action_verbs if verb in text) * 2,
+                'action_verbs': len(action_verbs) * 2,
                 'quality': 15 - sum(5 for issue in quality_issues.values() if issue),
                 'dates': len(date_ranges) * 2 
             },
             'missing_sections': [k for k, v in sections.items() if not v],
-            'action_verbs_found': sum(1 for verb in action_verbs if verb in text),
+            'action_verbs_found': len(action_verbs),
             'metrics_found': metrics,
+            'metric_kinds': self._count_metric_kinds(kwargs['context']),
             'quality_issues': quality_issues,
             'date_ranges_found': date_ranges,
             'suggestions': self._generate_suggestions(**kwargs),
-            'ai_opinion': self._ai_opinion(text)
+            # Filled in by _attach_opinion, possibly later by the opinion worker
+            'ai_opinion': None,
+            'ai_opinion_id': None
         }
         
         return feedback
@@ -580,7 +634,7 @@ class ResumeAnalyzer:
             sections['experience'] and 
             sections['education'] and 
             len(metrics) >= 5 and 
-            sum(1 for verb in action_verbs if verb in text) >= 8):
+            len(action_verbs) >= 8):
             
             suggestions.append("Outstanding! Your resume exceeds ATS optimization standards.")
         elif score >= 80:
@@ -601,7 +655,7 @@ class ResumeAnalyzer:
             suggestions.append("Boost impact: Add 2-3 quantifiable achievements (e.g., 'Increased sales by 30%')")
         
         # Action verb suggestions
-        verbs_found = sum(1 for verb in action_verbs if verb in text)
+        verbs_found = len(action_verbs)
         if verbs_found < 5:
             suggestions.append("Use more action verbs like 'developed', 'optimised', or 'managed' to describe achievements")
         
@@ -621,6 +675,7 @@ class ResumeAnalyzer:
 
     def _error_response(self, error_msg: str) -> Dict:
         """Standardized error format"""
+        metrics.inc('analysis_errors_total')
         return {
             'status': 'error',
             'error': error_msg,
@@ -632,41 +687,86 @@ class ResumeAnalyzer:
             },
             'feedback': {
                 'suggestions': ["Analysis failed - please check your input"],
-                'ai_opinion': self._ai_opinion(error_msg)
+                'ai_opinion': None
             }
         }
     
-    # AI Opinion on the resume
-    def _ai_opinion(self, resume_text: str) -> str:
-        """AI opinion generation"""
-        client = Groq(api_key="your_api_goes_here")
-
-        # AI Conversation Logic
-        chat_completion = client.chat.completions.create(
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a professional resume expert who helps users tailor their resumes with precision. Give a detailed opinion on the resume provided (UK English) by taking into consideration the job that the candidate would like to apply for. Remember that the resume is extracted text from a pdf/docx, so ignore the formating and links attached and focus on the core content. ",
-                },
-                {
-                    "role": "user",
-                    "content": resume_text + 'job that is being applied for: ' + job_title,
-                }
-            ],
-            model="llama-3.3-70b-versatile",
-        )
-        return chat_completion.choices[0].message.content.strip()
+    def _attach_opinion(self, result: Dict, clean_text: str, standardized_title: str, job_title: str):
+        """Uses a cached AI opinion when there is one, otherwise queues a new one"""
+        if not self.ai_opinion_enabled:
+            return
+
+        if self.opinion_cache is None:
+            self.opinion_cache = opinion_spool.get_opinion_cache()
+
+        key = opinion_spool.opinion_cache_key(clean_text, standardized_title)
+        cached = self.opinion_cache.get(key)
+        if cached:
+            result['feedback']['ai_opinion'] = cached['opinion']
+        else:
+            # Send a bounded digest instead of the whole (possibly OCR'd) text
+            prompt = build_opinion_prompt(self._build_context(clean_text), result['feedback'])
+            result['feedback']['ai_opinion_id'] = self._request_opinion(prompt, job_title, key)
+
+    def _request_opinion(self, resume_text: str, job_title: str, key: str = None) -> Optional[str]:
+        """Queues the AI opinion and returns the id the results page polls"""
+        try:
+            return opinion_spool.enqueue(resume_text, job_title, key=key)
+        except OSError as e:
+            print(f"Failed to queue AI opinion: {e}", file=sys.stderr)
+            return None
+
+    def cache_stats(self) -> Dict[str, Dict]:
+        """Hit, miss and eviction counters of this process's caches"""
+        return {
+            'results': self.result_cache.stats() if self.result_cache else None,
+            'sections': self.section_cache.stats() if self.section_cache else None,
+            'opinions': self.opinion_cache.stats() if self.opinion_cache else None
+        }
+
+    def close(self):
+        """Flushes write-behind state before the process exits"""
+        if self.title_learner:
+            self.title_learner.flush()
+        metrics.flush()
 
 
 if __name__ == "__main__":
+    # Persistent worker mode: python resume_analyser.py --worker [--socket PATH]
+    if len(sys.argv) > 1 and sys.argv[1] == '--worker':
+        import worker
+        ResumeAnalyzer.preload()
+        worker.run(ResumeAnalyzer, sys.argv[2:])
+        sys.exit(0)
+
+    # Offline re-scoring: python resume_analyser.py --batch INPUT -o OUTPUT
+    if len(sys.argv) > 1 and sys.argv[1] == '--batch':
+        import batch
+        ResumeAnalyzer.preload()
+        batch.run(ResumeAnalyzer, sys.argv[2:])
+        sys.exit(0)
+
     analyzer = ResumeAnalyzer()
-    
-    if len(sys.argv) < 3:
-        print(json.dumps(analyzer._error_response("Missing arguments")))
+
+    # --file PATH --job-title TITLE | --stdin frames (see cli_input.py)
+    import cli_input
+    try:
+        request = cli_input.read_input(sys.argv[1:])
+        if request:
+            document, job_title = request
+            resume_text = document.text()
+    except (OSError, ValueError, EOFError) as e:
+        print(json.dumps(analyzer._error_response(f"Invalid input: {str(e)}")))
         sys.exit(1)
-        
-    resume_text = base64.b64decode(sys.argv[1]).decode('utf-8')
-    job_title = base64.b64decode(sys.argv[2]).decode('utf-8')
+
+    if not request:
+        if len(sys.argv) < 3:
+            print(json.dumps(analyzer._error_response("Missing arguments")))
+            sys.exit(1)
+
+        # Legacy: base64 arguments
+        resume_text = base64.b64decode(sys.argv[1]).decode('utf-8')
+        job_title = base64.b64decode(sys.argv[2]).decode('utf-8')
     
     result = analyzer.analyze_resume(resume_text, job_title)
     print(json.dumps(result))
@@ -0,0 +1,199 @@
+import os
+import re
+import sys
+import json
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SECTIONS = ('contact', 'summary', 'experience', 'education', 'skills', 'projects')
+
+# A whole line naming the section, optionally followed by a colon
+HEADER_SYNONYMS: Dict[str, Tuple[str, ...]] = {
+    'contact': ('contact', 'contact information', 'contact details', 'personal details',
+                'personal information'),
+    'summary': ('summary', 'professional summary', 'career summary', 'profile',
+                'professional profile', 'about me', 'objective', 'career objective'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career history'),
+    'education': ('education', 'academic background', 'qualifications', 'education and training'),
+    'skills': ('skills', 'technical skills', 'key skills', 'core competencies', 'competencies',
+               'expertise'),
+    'projects': ('projects', 'selected projects', 'key projects', 'personal projects', 'portfolio'),
+}
+
+# Whole words that show a section is present without a header. Words that
+# turn up anywhere in a resume ("info", "details", "about me") are left out;
+# an email address ("@example.com") also counts for contact.
+CONTENT_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    'contact': ('email', 'e-mail', 'phone', 'mobile', 'linkedin', 'address'),
+    'summary': ('summary', 'objective'),
+    'experience': ('experience', 'employment', 'work history'),
+    'education': ('education', 'academic', 'degree', 'university', 'college', 'bachelor'),
+    'skills': ('skills', 'proficient', 'competencies', 'expertise'),
+    'projects': ('projects', 'portfolio', 'case studies'),
+}
+
+_EMAIL_DOMAIN = r'@[a-z0-9-]+\.[a-z]{2,}'
+
+# JSON file of extra header synonyms: {"experience": ["career highlights"], ...}
+SECTION_HEADERS_FILE = os.getenv('SECTION_HEADERS_FILE', '')
+
+
+def load_header_synonyms(path: str = SECTION_HEADERS_FILE) -> Dict[str, Tuple[str, ...]]:
+    """Built-in header synonyms plus any configured in SECTION_HEADERS_FILE"""
+    synonyms = dict(HEADER_SYNONYMS)
+    if not path:
+        return synonyms
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            extra = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring section headers file {path}: {e}", file=sys.stderr)
+        return synonyms
+
+    if not isinstance(extra, dict):
+        print(f"Ignoring section headers file {path}: expected a JSON object", file=sys.stderr)
+        return synonyms
+
+    for section, names in extra.items():
+        if section not in synonyms:
+            print(f"Ignoring header synonyms for unknown section '{section}'", file=sys.stderr)
+            continue
+        # A bare string would otherwise be read one letter at a time
+        if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+            print(f"Ignoring header synonyms for '{section}': expected a list of strings", file=sys.stderr)
+            continue
+        synonyms[section] += tuple(names)
+    return synonyms
+
+
+def _normalize(phrase: str) -> str:
+    return ' '.join(phrase.lower().split())
+
+
+def _trie_alternatives(phrases: Iterable[str]) -> List[str]:
+    """Top-level branches of a prefix-trie regex over literal phrases.
+
+    Each branch starts with a distinct literal character, so the regex engine
+    skips positions that cannot start a phrase and never re-tries a shared
+    prefix. A space in a phrase matches any run of spaces.
+    """
+    trie: Dict = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> List[str]:
+        return [
+            (' +' if char == ' ' else re.escape(char)) + _group(build(child), '' in child)
+            for char, child in sorted(node.items()) if char
+        ]
+
+    def _group(branches: List[str], optional: bool) -> str:
+        if not branches:
+            return ''
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        return f"(?:{'|'.join(branches)})" + ('?' if optional else '')
+
+    return build(trie)
+
+
+class SectionScan:
+    """Headers and header-less keyword evidence from one scan"""
+
+    __slots__ = ('headers', 'keyword_spans')
+
+    def __init__(self):
+        # [(section, header_start, header_end)] in text order
+        self.headers: List[Tuple[str, int, int]] = []
+        # {section: (start, end)} of the first keyword hit
+        self.keyword_spans: Dict[str, Tuple[int, int]] = {}
+
+    @property
+    def flags(self) -> Dict[str, bool]:
+        """{section: present} for every section, by header or keyword"""
+        found = {section for section, _, _ in self.headers}
+        return {section: section in found or section in self.keyword_spans for section in SECTIONS}
+
+
+class SectionDetector:
+    """Finds section headers and section keywords in a single regex scan.
+
+    Every header synonym and keyword is a branch of one alternation, built
+    as a prefix trie of literals; the optional `eol` group tells a phrase
+    that fills its whole line (a header) from one inside a sentence. Adding
+    synonyms adds branches, not passes over the text.
+    """
+
+    def __init__(self, header_synonyms: Optional[Dict[str, Iterable[str]]] = None,
+                 keywords: Optional[Dict[str, Iterable[str]]] = None):
+        header_synonyms = header_synonyms or HEADER_SYNONYMS
+        keywords = keywords or CONTENT_KEYWORDS
+
+        self.header_sections: Dict[str, str] = {
+            _normalize(name): section
+            for section in SECTIONS for name in header_synonyms.get(section, ())
+        }
+        self.keyword_sections: Dict[str, str] = {
+            _normalize(word): section
+            for section in SECTIONS for word in keywords.get(section, ())
+        }
+        # A header synonym in running text ("5 years of work experience") is
+        # matched as the longer phrase, hiding the keyword inside it; such a
+        # phrase counts as keyword evidence when it contains one of its
+        # section's keywords as a whole word
+        for phrase, section in self.header_sections.items():
+            words = f" {phrase} "
+            if phrase not in self.keyword_sections and any(
+                f" {keyword} " in words
+                for keyword, keyword_section in self.keyword_sections.items() if keyword_section == section
+            ):
+                self.keyword_sections[phrase] = section
+
+        phrases = set(self.header_sections) | set(self.keyword_sections)
+        phrases.discard('')
+
+        branches = _trie_alternatives(phrases) + [_EMAIL_DOMAIN]
+        self.pattern = re.compile(
+            rf"(?:{'|'.join(branches)})(?![a-z0-9])(?P<eol> *:?$)?",
+            re.M
+        )
+
+    def scan(self, lower_text: str) -> SectionScan:
+        """Scans lowercased text; offsets are valid for the original text"""
+        result = SectionScan()
+        headers, keyword_spans = result.headers, result.keyword_spans
+        header_sections, keyword_sections = self.header_sections, self.keyword_sections
+        for match in self.pattern.finditer(lower_text):
+            start, end = match.span()
+            eol = match.group('eol')
+            if eol is not None:
+                end -= len(eol)
+            phrase = lower_text[start:end]
+            if start and lower_text[start - 1].isalnum() and phrase[0] != '@':
+                continue  # inside a longer word
+            if '  ' in phrase:
+                phrase = _normalize(phrase)
+
+            if eol is not None and (not start or lower_text[start - 1] == '\n') and phrase in header_sections:
+                headers.append((header_sections[phrase], start, match.end()))
+                continue
+
+            section = 'contact' if phrase[0] == '@' else keyword_sections.get(phrase)
+            if section and section not in keyword_spans:
+                keyword_spans[section] = (start, end)
+        return result
+
+
+_detector = None
+
+
+def get_section_detector() -> SectionDetector:
+    """Process-wide detector, built on first use with the configured synonyms"""
+    global _detector
+    if _detector is None:
+        _detector = SectionDetector(load_header_synonyms())
+    return _detector
@@ -0,0 +1,31 @@
+"""Regression cases for analysis_context.
+
+    python -m pytest ai/tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis_context import AnalysisContext
+from section_detector import SectionDetector
+
+RESUME = "Jane Doe\nEducation\nBSc Computer Science\nSkills\nPython, SQL"
+
+
+def segment_texts(text):
+    context = AnalysisContext(text, SectionDetector())
+    return {section: text[start:end] for section, start, _, end in context.segments}
+
+
+def test_segment_text_does_not_depend_on_the_next_section():
+    alone = segment_texts(RESUME)
+    followed = segment_texts(RESUME + "\nProjects\nBuilt a parser\n")
+    assert followed['skills'] == alone['skills'] == "Skills\nPython, SQL"
+    assert followed['education'] == alone['education']
+
+
+def test_section_bounds_match_segment_bodies():
+    context = AnalysisContext(RESUME + "\n\n", SectionDetector())
+    for section, _, body_start, end in context.segments[1:]:
+        assert context.section_bounds[section] == (body_start, end)
@@ -0,0 +1,31 @@
+"""Regression cases for metric_extractor.
+
+    python -m pytest ai/tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metric_extractor import find_metrics
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('over 10+ years of sales', [('duration', '10+ years')]),
+    ('5+ yrs in retail', [('duration', '5+ yrs')]),
+    ('10+ clients', [('count', '10+ clients')]),
+    ('$5+ million', [('money', '$5+')]),
+])
+def test_plus_unit(text, expected):
+    assert find_metrics(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('4.5/5 rating', []),
+    ('scored 95/100', []),
+    ('1200/1500 users', [('count', '1200')]),
+])
+def test_number_after_slash_is_not_a_new_metric(text, expected):
+    assert find_metrics(text) == expected
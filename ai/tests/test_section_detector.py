@@ -0,0 +1,29 @@
+"""Regression cases for section_detector.
+
+    python -m pytest ai/tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from section_detector import SectionDetector
+
+
+@pytest.mark.parametrize('text, section', [
+    ('i have 5 years of work experience in retail', 'experience'),
+    ('strong technical skills in python', 'skills'),
+    ('key projects include x', 'projects'),
+    ('my employment history shows', 'experience'),
+])
+def test_header_synonym_in_running_text_is_keyword_evidence(text, section):
+    scan = SectionDetector().scan(text)
+    assert scan.headers == []
+    assert section in scan.keyword_spans
+
+
+def test_header_synonym_on_own_line_is_header():
+    scan = SectionDetector().scan('jane doe\nwork experience\nacme corp')
+    assert [section for section, _, _ in scan.headers] == ['experience']
@@ -0,0 +1,58 @@
+import re
+from typing import Dict
+
+# Non-ASCII characters with an ASCII meaning in resumes; every other non-ASCII
+# character except KEPT_CHARACTERS is dropped by the final ASCII encode
+_BULLETS = '\u2022\u2023\u2043\u2219\u25aa\u25ab\u25cf\u25e6\u25a0\u25a1\u27a2\uf0b7'
+_SPACES = '\u00a0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u202f\u205f\u3000'
+_DASHES = '\u2010\u2011\u2012\u2013\u2014\u2015\u2212'
+
+TRANSLATION_TABLE: Dict[str, str] = {
+    **{char: ' ' for char in _BULLETS + _SPACES},
+    **{char: '-' for char in _DASHES},
+    '\u2018': "'", '\u2019': "'", '\u201a': "'", '\u201b': "'",
+    '\u201c': '"', '\u201d': '"', '\u201e': '"',
+    '\u2026': '...',
+    # Ligatures from PDF text layers and OCR
+    '\ufb00': 'ff', '\ufb01': 'fi', '\ufb02': 'fl', '\ufb03': 'ffi', '\ufb04': 'ffl',
+    '\u0085': '\n', '\u2028': '\n', '\u2029': '\n',
+}
+
+# Currency signs the metric extractor reads as money ("£500k", "€2m")
+KEPT_CHARACTERS = '\u00a3\u20ac'
+_PLACEHOLDERS = '\x01\x02'
+
+# URLs and "Page N" markers in one scan. Both branches start from one leading
+# character class, so the regex engine skips straight to candidate positions.
+ARTEFACT_PATTERN = re.compile(
+    r'[hHpP](?:(?<=h)ttps?://\S+|(?<=[pP])(?<!\w[pP])(?:age|AGE) *\d+\b)'
+)
+
+
+def to_ascii(text: str) -> str:
+    """Maps TRANSLATION_TABLE characters and drops other non-ASCII ones but KEPT_CHARACTERS"""
+    if text.isascii():
+        return text
+    for char, replacement in TRANSLATION_TABLE.items():
+        # Substring search and replace both run in C; most characters are absent
+        if char in text:
+            text = text.replace(char, replacement)
+    # Kept characters survive the encode as control-character placeholders
+    kept = [pair for pair in zip(KEPT_CHARACTERS, _PLACEHOLDERS) if pair[0] in text]
+    for char, placeholder in kept:
+        text = text.replace(placeholder, '').replace(char, placeholder)
+    text = text.encode('ascii', errors='ignore').decode('ascii')
+    for char, placeholder in kept:
+        text = text.replace(placeholder, char)
+    return text
+
+
+def clean_text(text: str) -> str:
+    """ASCII text (plus £ and € signs) that keeps the source's line breaks.
+
+    Bullets become spaces, typographic dashes and quotes their ASCII forms,
+    URLs and "Page N" markers are removed, each line's whitespace collapses
+    to single spaces and blank lines are dropped. Linear in the input.
+    """
+    text = ARTEFACT_PATTERN.sub('', to_ascii(text))
+    return '\n'.join(filter(None, (' '.join(line.split()) for line in text.splitlines())))
@@ -0,0 +1,123 @@
+"""Per-request stage timings and one-shot profiling.
+
+Code marks a stage with `with stage('name'):`. While a request is being
+timed (see `timed`), the elapsed monotonic time is added to that request's
+Timings; otherwise `stage` returns a shared no-op context manager, so
+instrumented code costs one ContextVar lookup when timings are off.
+
+ANALYSER_PROFILE=cprofile|tracemalloc profiles the next request in each
+process and writes the dump to ANALYSER_PROFILE_DIR.
+"""
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+# Adds a "timings" object to every analysis result
+TIMINGS_ENABLED = os.getenv('ANALYSER_TIMINGS', '1') != '0'
+
+PROFILE_MODE = os.getenv('ANALYSER_PROFILE', '')
+PROFILE_DIR = os.getenv('ANALYSER_PROFILE_DIR', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'storage', 'app', 'profiles'
+))
+
+_current: ContextVar[Optional['Timings']] = ContextVar('analysis_timings', default=None)
+_NO_OP = nullcontext()
+_profiled_pids = set()
+
+
+class _Stage:
+    __slots__ = ('timings', 'name', 'started')
+
+    def __init__(self, timings: 'Timings', name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        self.timings.stages[self.name] = self.timings.stages.get(self.name, 0.0) + elapsed
+        return False
+
+
+class Timings:
+    """Seconds per named stage; nested stages are also counted in their parent"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self.profile: Optional[str] = None
+
+    def stage(self, name: str) -> _Stage:
+        return _Stage(self, name)
+
+    def as_dict(self) -> Dict:
+        timings = {
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 3),
+            'stages_ms': {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()}
+        }
+        if self.profile:
+            timings['profile'] = self.profile
+        return timings
+
+
+def stage(name: str):
+    """Times the block into the current request's Timings, if any"""
+    timings = _current.get()
+    return timings.stage(name) if timings is not None else _NO_OP
+
+
+@contextmanager
+def timed(enabled: bool = TIMINGS_ENABLED) -> Iterator[Optional[Timings]]:
+    """Collects stage timings for the enclosed request (None when disabled)"""
+    if not enabled and not _profile_due():
+        yield None
+        return
+
+    timings = Timings()
+    token = _current.set(timings)
+    try:
+        if _profile_due():
+            with _profiled(timings):
+                yield timings
+        else:
+            yield timings
+    finally:
+        _current.reset(token)
+
+
+def _profile_due() -> bool:
+    return bool(PROFILE_MODE) and os.getpid() not in _profiled_pids
+
+
+@contextmanager
+def _profiled(timings: Timings):
+    """Profiles one request; the dump path is reported in the timings"""
+    _profiled_pids.add(os.getpid())
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"analysis-{os.getpid()}-{int(time.time())}")
+
+    if PROFILE_MODE == 'tracemalloc':
+        import tracemalloc
+        tracemalloc.start(25)
+        try:
+            yield
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            timings.profile = path + '.tracemalloc'
+            snapshot.dump(timings.profile)
+        return
+
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        timings.profile = path + '.prof'
+        profiler.dump_stats(timings.profile)
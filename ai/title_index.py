@@ -0,0 +1,118 @@
+import re
+import sys
+import time
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+_NON_ALNUM = re.compile(r'[^a-z0-9\s]')
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace"""
+    return ' '.join(_NON_ALNUM.sub('', title.lower()).split())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Character trigrams of a normalised title, padded at word edges"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleIndex:
+    """In-memory view of standardised_job_titles.
+
+    Exact lookups are a dict hit on the normalised title; fuzzy lookups use a
+    character-trigram inverted index and rank candidates by Dice similarity.
+    """
+
+    def __init__(self):
+        self.exact: Dict[str, str] = {}           # normalised title -> standardised title
+        self.keys: List[str] = []                 # normalised titles, by key id
+        self.key_sizes: List[int] = []            # trigram count per key id
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.last_row_id = 0
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, title: str, standardised_title: str):
+        """Indexes a title (original or standardised) under its standardised form"""
+        key = normalize_title(title)
+        if not key or key in self.exact:
+            return
+
+        with self.lock:
+            key_id = len(self.keys)
+            grams = trigrams(key)
+            self.exact[key] = standardised_title
+            self.keys.append(key)
+            self.key_sizes.append(len(grams))
+            for gram in grams:
+                self.postings[gram].append(key_id)
+
+    def lookup(self, title: str) -> Optional[str]:
+        """Exact match on the normalised title"""
+        return self.exact.get(normalize_title(title))
+
+    def search(self, title: str, limit: int = 5, min_score: float = 0.3) -> List[Tuple[str, float]]:
+        """Ranked [(standardised_title, score)] of the closest known titles"""
+        key = normalize_title(title)
+        if not key:
+            return []
+
+        grams = trigrams(key)
+        shared = defaultdict(int)
+        for gram in grams:
+            for key_id in self.postings.get(gram, ()):
+                shared[key_id] += 1
+
+        best: Dict[str, float] = {}
+        for key_id, count in shared.items():
+            score = 2 * count / (len(grams) + self.key_sizes[key_id])
+            if score < min_score:
+                continue
+            standardised = self.exact[self.keys[key_id]]
+            if score > best.get(standardised, 0):
+                best[standardised] = score
+
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+        return [(name, round(score, 3)) for name, score in ranked[:limit]]
+
+    def resolve(self, title: str, threshold: float = 0.8) -> Optional[str]:
+        """Exact standardised title, or the best fuzzy candidate above `threshold`"""
+        exact = self.lookup(title)
+        if exact:
+            return exact
+        candidates = self.search(title, limit=1, min_score=threshold)
+        return candidates[0][0] if candidates else None
+
+    def refresh(self, db) -> Optional[int]:
+        """Loads rows added since the last refresh.
+
+        Returns how many were new, or None when the database is unavailable.
+        """
+        rows = db.query('titles_since', (self.last_row_id,))
+        if rows is None:
+            return None
+
+        for row_id, original_title, standardised_title in rows:
+            self.add(standardised_title, standardised_title)
+            self.add(original_title, standardised_title)
+            self.last_row_id = max(self.last_row_id, row_id)
+        return len(rows)
+
+    def start_auto_refresh(self, db, interval: float = 300.0) -> threading.Thread:
+        """Refreshes from the connection pool every `interval` seconds"""
+        def _loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.refresh(db)
+                except Exception as e:
+                    print(f"Title index refresh failed: {e}", file=sys.stderr)
+
+        thread = threading.Thread(target=_loop, name='title-index-refresh', daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,110 @@
+import os
+import sys
+import atexit
+import hashlib
+import threading
+from collections import Counter
+from typing import Callable, Optional
+
+# Distinct titles seen this often are promoted into standardised_job_titles
+PROMOTE_AFTER = int(os.getenv('LEARNED_TITLE_PROMOTE_AFTER', 3))
+FLUSH_INTERVAL = float(os.getenv('LEARNED_TITLE_FLUSH_INTERVAL', 30))
+
+
+def learned_title_code(title: str) -> str:
+    """original_code is required and unique; learned titles get a stable synthetic one"""
+    return 'LRN-' + hashlib.sha1(title.lower().encode('utf-8')).hexdigest()[:16]
+
+
+class TitleLearner:
+    """Write-behind frequency counter for job titles that are not yet known.
+
+    `record` only bumps an in-memory Counter. A background thread flushes the
+    counts every `interval` seconds, or as soon as `flush_size` distinct titles
+    are waiting, as one batched upsert into learned_job_titles; titles that
+    reach `promote_after` across all processes are then promoted into
+    standardised_job_titles in bulk. Counts from a failed flush are kept for
+    the next one, up to `max_pending` distinct titles.
+    """
+
+    def __init__(self, db, promote_after: int = PROMOTE_AFTER, interval: float = FLUSH_INTERVAL,
+                 flush_size: int = 100, max_pending: int = 10000,
+                 on_promote: Optional[Callable[[str], None]] = None):
+        self.db = db
+        self.promote_after = promote_after
+        self.interval = interval
+        self.flush_size = flush_size
+        self.max_pending = max_pending
+        self.on_promote = on_promote
+
+        self.pending = Counter()
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+        self.dropped = 0
+
+    def record(self, title: str):
+        """Counts one sighting; never touches the database"""
+        title = title.strip()[:255]
+        if not title:
+            return
+
+        with self.lock:
+            if title not in self.pending and len(self.pending) >= self.max_pending:
+                self.dropped += 1
+                return
+            self.pending[title] += 1
+            full = len(self.pending) >= self.flush_size
+
+        self._ensure_thread()
+        if full:
+            self.wake.set()
+
+    def _ensure_thread(self):
+        # Started on first use, so it belongs to the process that records
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name='title-learner', daemon=True)
+            self.thread.start()
+            atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            self.flush()
+
+    def flush(self) -> bool:
+        """Writes pending counts and promotes titles; False if the database refused them"""
+        with self.flush_lock:
+            with self.lock:
+                batch, self.pending = self.pending, Counter()
+            if not batch:
+                return True
+
+            if not self.db.executemany('count_learned_title', sorted(batch.items())):
+                with self.lock:
+                    # Merge back; the next flush retries them
+                    for title, count in batch.items():
+                        if title in self.pending or len(self.pending) < self.max_pending:
+                            self.pending[title] += count
+                return False
+
+            self._promote()
+            return True
+
+    def _promote(self):
+        rows = self.db.query('promotable_titles', (self.promote_after,))
+        if not rows:
+            return
+
+        titles = [row[0] for row in rows]
+        if not self.db.executemany('import_title', [(learned_title_code(t), t, t) for t in titles]):
+            return
+        # A crash between the two writes only repeats the idempotent upsert
+        self.db.executemany('mark_promoted', [(t,) for t in titles])
+
+        if self.on_promote:
+            for title in titles:
+                self.on_promote(title)
+        print(f"Promoted {len(titles)} learned job title(s)", file=sys.stderr)
@@ -0,0 +1,79 @@
+import zlib
+from typing import Iterable, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from title_index import normalize_title, trigrams
+
+# Hashed feature space for character trigrams
+N_FEATURES = 2 ** 18
+
+
+def _feature_ids(text: str) -> List[int]:
+    """Hashed trigram ids of a normalised string (crc32 is stable across processes)"""
+    return [
+        zlib.crc32(gram.encode('utf-8')) % N_FEATURES
+        for word in normalize_title(text).split()
+        for gram in trigrams(word)
+    ]
+
+
+class TitleVectorizer:
+    """TF-IDF over hashed character trigrams, fitted on the job title corpus.
+
+    Rows of every matrix are L2-normalised, so a sparse matrix product gives
+    cosine similarities directly.
+    """
+
+    def __init__(self, titles: Iterable[str]):
+        self.titles = list(dict.fromkeys(t for t in titles if t))
+
+        counts = self._count_matrix(self.titles)
+        document_frequency = np.bincount(counts.indices, minlength=N_FEATURES)
+        self.idf = (np.log((1 + len(self.titles)) / (1 + document_frequency)) + 1).astype(np.float32)
+        self.title_matrix = self._weight(counts)
+        self.title_rows = {normalize_title(t): i for i, t in enumerate(self.titles)}
+
+    def _count_matrix(self, texts: List[str]) -> sparse.csr_matrix:
+        indptr, indices = [0], []
+        for text in texts:
+            indices.extend(_feature_ids(text))
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.float32)
+        counts = sparse.csr_matrix((data, indices, indptr), shape=(len(texts), N_FEATURES))
+        counts.sum_duplicates()
+        return counts
+
+    def _weight(self, counts: sparse.csr_matrix) -> sparse.csr_matrix:
+        """Applies sublinear tf, idf and row L2 normalisation"""
+        weighted = counts.copy()
+        weighted.data = (1 + np.log(weighted.data)) * self.idf[weighted.indices]
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms).dot(weighted).tocsr()
+
+    def transform(self, texts: List[str]) -> sparse.csr_matrix:
+        """Vectorises texts (e.g. resume sentences) into normalised rows"""
+        return self._weight(self._count_matrix(texts))
+
+    def title_vector(self, title: str) -> sparse.csr_matrix:
+        row = self.title_rows.get(normalize_title(title))
+        if row is not None:
+            return self.title_matrix[row]
+        return self.transform([title])
+
+    def similarity(self, resume_matrix: sparse.csr_matrix, title: str) -> float:
+        """Best cosine similarity between the title and any resume row"""
+        if resume_matrix.shape[0] == 0:
+            return 0.0
+        scores = resume_matrix.dot(self.title_vector(title).T).toarray()
+        return float(scores.max())
+
+    def rank(self, resume_matrix: sparse.csr_matrix, limit: int = 5) -> List[Tuple[str, float]]:
+        """Best-matching corpus titles for the resume, in one matrix product"""
+        if resume_matrix.shape[0] == 0 or not self.titles:
+            return []
+        scores = resume_matrix.dot(self.title_matrix.T).max(axis=0).toarray().ravel()
+        top = np.argsort(scores)[::-1][:limit]
+        return [(self.titles[i], round(float(scores[i]), 3)) for i in top]
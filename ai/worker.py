@@ -0,0 +1,212 @@
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import argparse
+import functools
+from typing import Callable, Dict, Optional
+
+from cli_input import InputDocument
+from pipeline import run_pipeline
+
+# A worker that fails within this many seconds of starting counts as a crash
+# loop; it is respawned after a delay that doubles up to RESPAWN_MAX_DELAY
+FAST_FAILURE_SECONDS = 10
+RESPAWN_MIN_DELAY = 0.5
+RESPAWN_MAX_DELAY = 30
+
+
+def handle_request(analyzer, request: Dict) -> Dict:
+    """Runs one JSON request through a warm analyzer"""
+    if request.get('cmd') == 'stats':
+        return {'status': 'success', 'pid': os.getpid(), 'cache': analyzer.cache_stats()}
+
+    job_title = request.get('job_title')
+    if request.get('file_path'):
+        # Whole pipeline: extraction, OCR of scanned pages, analysis
+        result = run_pipeline(analyzer, InputDocument(path=request['file_path']), job_title)
+    else:
+        result = analyzer.analyze_resume(request.get('resume_text'), job_title)
+
+    # Echo the request id so clients can pipeline requests
+    if 'id' in request:
+        result['id'] = request['id']
+    return result
+
+
+def _parse_line(analyzer, line: str) -> Optional[Dict]:
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+    except ValueError as e:
+        return analyzer._error_response(f"Invalid request: {str(e)}")
+    return handle_request(analyzer, request)
+
+
+def serve_stdin(analyzer_factory: Callable):
+    """Single warm process answering JSON lines from stdin on stdout"""
+    analyzer = analyzer_factory()
+
+    try:
+        for line in sys.stdin:
+            result = _parse_line(analyzer, line)
+            if result is None:
+                continue
+            sys.stdout.write(json.dumps(result) + "\n")
+            sys.stdout.flush()
+    finally:
+        analyzer.close()
+
+
+def _serve_connection(analyzer, conn: socket.socket, limit: int = 0) -> int:
+    """Answers request lines on one client connection, at most `limit` (0 = no limit).
+
+    The connection is closed once the limit is reached; clients reconnect
+    to the next worker.
+    """
+    handled = 0
+    with conn, conn.makefile('r', encoding='utf-8') as reader, \
+            conn.makefile('w', encoding='utf-8') as writer:
+        for line in reader:
+            result = _parse_line(analyzer, line)
+            if result is None:
+                continue
+            writer.write(json.dumps(result) + "\n")
+            writer.flush()
+            handled += 1
+            if limit and handled >= limit:
+                break
+    return handled
+
+
+def _child_loop(analyzer_factory: Callable, listener: socket.socket, max_requests: int):
+    """Accept loop of a single forked worker"""
+    # Unwind on shutdown so pending write-behind counts are flushed
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    # Built after fork so every child owns its DB connection
+    analyzer = analyzer_factory()
+    handled = 0
+
+    try:
+        while not max_requests or handled < max_requests:
+            conn, _ = listener.accept()
+            try:
+                handled += _serve_connection(analyzer, conn, max_requests - handled if max_requests else 0)
+            except (BrokenPipeError, ConnectionResetError):
+                continue
+    finally:
+        # os._exit skips atexit handlers
+        analyzer.close()
+
+
+def _spawn(analyzer_factory: Callable, listener: socket.socket, max_requests: int) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _child_loop(analyzer_factory, listener, max_requests)
+        except Exception as e:
+            print(f"Worker {os.getpid()} crashed: {str(e)}", file=sys.stderr)
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def serve_socket(analyzer_factory: Callable, path: str, workers: int = 2, max_requests: int = 500):
+    """Pre-forking server on a Unix domain socket.
+
+    Heavy state (models and libraries, see ResumeAnalyzer.preload) is loaded
+    by the parent before forking, so children share it copy-on-write. Each
+    child exits after `max_requests` requests and is replaced by the parent;
+    children that keep failing right after start are respawned with backoff.
+    """
+    if os.path.exists(path):
+        os.unlink(path)
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(128)
+
+    children = {}  # pid -> start time
+    stopping = False
+    respawn_delay = 0.0
+
+    def _stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    try:
+        for _ in range(max(1, workers)):
+            children[_spawn(analyzer_factory, listener, max_requests)] = time.monotonic()
+
+        while children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            started = children.pop(pid, None)
+            if started is None:
+                continue
+
+            # A worker that cannot even start (database down, model missing)
+            # would otherwise be re-forked in a tight loop
+            if status and time.monotonic() - started < FAST_FAILURE_SECONDS:
+                respawn_delay = min(RESPAWN_MAX_DELAY, max(RESPAWN_MIN_DELAY, respawn_delay * 2))
+                print(f"Worker {pid} failed on start, respawning in {respawn_delay:g}s", file=sys.stderr)
+                time.sleep(respawn_delay)
+            else:
+                respawn_delay = 0.0
+
+            # Recycle the exited worker
+            if not stopping:
+                children[_spawn(analyzer_factory, listener, max_requests)] = time.monotonic()
+    finally:
+        listener.close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def _load_analyzer(analyzer_factory: Callable, **kwargs):
+    """Builds an analyzer with its title index loaded before the first request"""
+    analyzer = analyzer_factory(**kwargs)
+    analyzer.load_title_index()
+    return analyzer
+
+
+def run(analyzer_factory: Callable, argv):
+    """Entry point for `resume_analyser.py --worker [options]`"""
+    parser = argparse.ArgumentParser(prog='resume_analyser.py --worker')
+    parser.add_argument('--socket', help='Unix socket path (default: JSON lines on stdin)')
+    parser.add_argument('--workers', type=int, default=int(os.getenv('ANALYSER_WORKERS', 2)),
+                        help='Number of pre-forked processes in socket mode')
+    parser.add_argument('--max-requests', type=int, default=int(os.getenv('ANALYSER_MAX_REQUESTS', 500)),
+                        help='Recycle a socket worker after this many requests (0 = never)')
+    parser.add_argument('--title-refresh', type=float, default=float(os.getenv('TITLE_INDEX_REFRESH', 300)),
+                        help='Seconds between job title index refreshes (0 = never)')
+    args = parser.parse_args(argv)
+
+    analyzer_factory = functools.partial(_load_analyzer, analyzer_factory, title_refresh_interval=args.title_refresh)
+
+    if args.socket:
+        serve_socket(analyzer_factory, args.socket, args.workers, args.max_requests)
+    else:
+        serve_stdin(analyzer_factory)
@@ -30,40 +30,30 @@ public function upload(Request $request)
             $path = $file->store('resumes');
             $jobTitle = $request->input('job_title');
 
-            // First, attempt to extract text from the file
-            $text = $this->extractText($file, $jobTitle);
-
-            // If text extraction fails, use OCR fallback
-            if (!$text) {
-                // Log that we are falling back to OCR
-                Log::info('Text extraction failed, falling back to OCR processing');
+            // PDFs go through the Python pipeline: text layer, OCR of scanned pages and analysis in one process
+            $analysis = null;
+            if (strtolower($file->getClientOriginalExtension()) === 'pdf') {
+                $analysis = $this->runPipeline($file->getRealPath(), $jobTitle);
+            }
 
-                $fileContent = file_get_contents($file); // Get file content in raw binary form
-                $text = $this->runOcrFallback($fileContent, $jobTitle); // Run OCR if text extraction fails
+            if (!$analysis) {
+                $text = $this->extractText($file);
 
                 if (!$text) {
-                    throw new \Exception("Could not extract text from the resume. Image-based PDFs not supported.");
+                    throw new \Exception("Could not extract text from the resume.");
                 }
-            }
-
-            // Now that we have the text (either extracted or via OCR), pass it to Python
-            $result = Process::run([
-                'python', 
-                base_path('ai/resume_analyser.py'), 
-                base64_encode($text), 
-                base64_encode($jobTitle) 
-            ]);
 
-            if ($result->failed()) {
-                throw new \Exception("Python script failed: " . $result->errorOutput());
+                $analysis = $this->runAnalyser($text, $jobTitle);
             }
 
-            $analysis = json_decode($result->output(), true);
-
             if (json_last_error() !== JSON_ERROR_NONE || !isset($analysis['score'])) {
                 throw new \Exception("Invalid analysis output");
             }
 
+            if (isset($analysis['timings'])) {
+                Log::info("Resume analysed in {$analysis['timings']['total_ms']}ms", $analysis['timings']);
+            }
+
             // Store job title in the database
             $resume = Resume::create([
                 'filename' => $file->getClientOriginalName(),
@@ -83,43 +73,101 @@ public function upload(Request $request)
         }
     }
 
-    // OCR fallback method to handle image-based PDFs
-    protected function runOcrFallback($fileContent, $jobTitle)
+    // One JSON request to the warm worker pool, or null when it is not configured or not answering
+    protected function sendToWorker(array $request)
     {
-        try {
-            $encodedFileContent = base64_encode($fileContent); // Encode the PDF file content
-            $encodedJobTitle = base64_encode($jobTitle); // Encode the job title
+        $socketPath = config('services.analyser.socket');
 
-            // Execute the OCR fallback Python script
-            $result = Process::run([
-                'python3', 
-                base_path('ai/ocr_fallback.py'),
-                $encodedFileContent,
-                $encodedJobTitle
-            ]);
+        if (!$socketPath || !file_exists($socketPath)) {
+            return null;
+        }
+
+        $socket = @stream_socket_client('unix://' . $socketPath, $errno, $errstr, 5);
+
+        if ($socket) {
+            stream_set_timeout($socket, (int) config('services.analyser.timeout', 60));
+            fwrite($socket, json_encode($request) . "\n");
+            $line = fgets($socket);
+            fclose($socket);
 
-            if ($result->failed()) {
-                Log::error("OCR fallback failed: " . $result->errorOutput());
-                return null; // If OCR fails, return null
+            if ($line !== false) {
+                return json_decode($line, true);
             }
+        }
 
-            // Return the text extracted via OCR
-            return $result->output();
+        Log::warning("Analyser worker unavailable, starting a new process: " . ($errstr ?: 'no response'));
+        return null;
+    }
 
-        } catch (\Exception $e) {
-            Log::error("OCR fallback execution failed: " . $e->getMessage());
+    // Send the text to the warm worker pool if configured, otherwise start a one-off process
+    protected function runAnalyser($text, $jobTitle)
+    {
+        $analysis = $this->sendToWorker([
+            'resume_text' => $text,
+            'job_title' => $jobTitle,
+        ]);
+
+        if ($analysis) {
+            return $analysis;
+        }
+
+        // Text and title go over stdin as length-prefixed frames (see ai/cli_input.py)
+        $result = Process::input($this->frame($text) . $this->frame($jobTitle))->run([
+            'python',
+            base_path('ai/resume_analyser.py'),
+            '--stdin'
+        ]);
+
+        if ($result->failed()) {
+            throw new \Exception("Python script failed: " . $result->errorOutput());
+        }
+
+        return json_decode($result->output(), true);
+    }
+
+    // Extraction, OCR where needed and analysis of an uploaded PDF; null if the pipeline is unavailable
+    protected function runPipeline($filePath, $jobTitle)
+    {
+        $output = $this->sendToWorker([
+            'file_path' => $filePath,
+            'job_title' => $jobTitle,
+        ]);
+
+        if (!$output) {
+            $result = Process::run([
+                'python',
+                base_path('ai/pipeline.py'),
+                '--file',
+                $filePath,
+                '--job-title',
+                $jobTitle
+            ]);
+            $output = json_decode($result->output(), true);
+        }
+
+        if (!isset($output['analysis'])) {
+            Log::warning("PDF pipeline failed: " . ($output['error'] ?? 'no output'));
             return null;
         }
+
+        Log::info("PDF extracted in {$output['extraction']['seconds']}s", ['pages' => $output['extraction']['pages']]);
+        return $output['analysis'];
+    }
+
+    // 4-byte big-endian length followed by the payload
+    protected function frame($payload)
+    {
+        return pack('N', strlen($payload)) . $payload;
     }
 
-    private function extractText($file, $jobTitle = null)
+    private function extractText($file)
     {
         $extension = $file->getClientOriginalExtension();
         $path = $file->getRealPath();
     
         // Handle PDF files
         if ($extension === 'pdf') {
-            // First attempt: Try smalot/pdfparser (fast for text-based PDFs)
+            // Fallback when the Python pipeline is unavailable: smalot/pdfparser (text-based PDFs only)
             try {
                 $parser = new \Smalot\PdfParser\Parser();
                 $pdf = $parser->parseFile($path);
@@ -131,25 +179,8 @@ private function extractText($file, $jobTitle = null)
             } catch (\Exception $e) {
                 \Log::warning("PDF parsing failed: " . $e->getMessage());
             }
-    
-            // Fallback: Python OCR for image-based PDFs
-            try {
-                $result = Process::run([
-                    'python',
-                    base_path('ai/ocr_fallback.py'),
-                    base64_encode(file_get_contents($path)),
-                    base64_encode($jobTitle ?? '')
-                ]);                               
-    
-                if ($result->failed()) {
-                    throw new \Exception("OCR failed: " . $result->errorOutput());
-                }
-    
-                return trim($result->output());
-            } catch (\Exception $e) {
-                \Log::error("OCR fallback failed: " . $e->getMessage());
-                return null;
-            }
+
+            return null;
         }
         // Handle DOCX files (your existing code)
         elseif ($extension === 'docx') {
@@ -182,4 +213,37 @@ public function showResults($id)
         
         return view('results', compact('resume'));
     }
+
+    // Polled by the results page until the background AI opinion is ready
+    public function opinion($id)
+    {
+        $resume = Resume::findOrFail($id);
+        $feedback = json_decode($resume->feedback, true) ?? [];
+
+        if (!empty($feedback['ai_opinion'])) {
+            return response()->json(['status' => 'done', 'opinion' => $feedback['ai_opinion']]);
+        }
+
+        $opinionId = $feedback['ai_opinion_id'] ?? null;
+        if (!$opinionId || !preg_match('/^[a-f0-9]{32}$/', $opinionId)) {
+            return response()->json(['status' => 'failed', 'opinion' => null]);
+        }
+
+        $path = storage_path("app/opinions/{$opinionId}.json");
+        if (!file_exists($path)) {
+            return response()->json(['status' => 'pending', 'opinion' => null]);
+        }
+
+        $job = json_decode(file_get_contents($path), true) ?? [];
+        $status = $job['status'] ?? 'failed';
+
+        // Keep the finished opinion with the resume so the file is no longer needed
+        if ($status === 'done') {
+            $feedback['ai_opinion'] = $job['opinion'];
+            $resume->feedback = json_encode($feedback);
+            $resume->save();
+        }
+
+        return response()->json(['status' => $status, 'opinion' => $job['opinion'] ?? null]);
+    }
 }
@@ -28,6 +28,13 @@
         'key' => env('RESEND_KEY'),
     ],
 
+    'analyser' => [
+        // Unix socket of a warm `resume_analyser.py --worker` pool; when
+        // empty every upload starts a fresh Python process instead.
+        'socket' => env('ANALYSER_SOCKET'),
+        'timeout' => env('ANALYSER_TIMEOUT', 60),
+    ],
+
     'slack' => [
         'notifications' => [
             'bot_user_oauth_token' => env('SLACK_BOT_USER_OAUTH_TOKEN'),
@@ -226,10 +226,20 @@ function formatAiOpinion($text) {
                                     return $formatted;
                                 }
                                     
-                                    $ai_opinion = $feedback['ai_opinion'] ?? 'No AI opinion available.';
+                                    $ai_opinion = $feedback['ai_opinion'] ?? null;
+                                    $ai_opinion_pending = !$ai_opinion && !empty($feedback['ai_opinion_id']);
                                 @endphp
                                 
-                                <p>{!! formatAiOpinion($ai_opinion) !!}</p>
+                                @if($ai_opinion)
+                                    <p>{!! formatAiOpinion($ai_opinion) !!}</p>
+                                @elseif($ai_opinion_pending)
+                                    <p id="ai-opinion-status" class="text-muted mb-0">
+                                        <span class="spinner-border spinner-border-sm me-2" role="status"></span>
+                                        Generating AI opinion...
+                                    </p>
+                                @else
+                                    <p>No AI opinion available.</p>
+                                @endif
 
                             </div>
             
@@ -247,4 +257,26 @@ function formatAiOpinion($text) {
         </div>
     </div>
 </div>
-@endsection
\ No newline at end of file
+@endsection
+
+@if($ai_opinion_pending)
+@push('scripts')
+<script>
+    // The opinion is generated in the background; reload once it is ready
+    (function pollOpinion(attempt) {
+        fetch("{{ route('results.opinion', $resume->id) }}")
+            .then(response => response.json())
+            .then(data => {
+                if (data.status === 'done') {
+                    window.location.reload();
+                } else if (data.status === 'failed' || attempt >= 40) {
+                    document.getElementById('ai-opinion-status').textContent = 'No AI opinion available.';
+                } else {
+                    setTimeout(() => pollOpinion(attempt + 1), 3000);
+                }
+            })
+            .catch(() => setTimeout(() => pollOpinion(attempt + 1), 3000));
+    })(0);
+</script>
+@endpush
+@endif
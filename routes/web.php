@@ -11,6 +11,7 @@
 Route::get('/', [ResumeController::class, 'showUploadForm'])->name('home');
 Route::post('/upload', [ResumeController::class, 'upload'])->name('upload');
 Route::get('/results/{id}', [ResumeController::class, 'showResults'])->name('results');
+Route::get('/results/{id}/opinion', [ResumeController::class, 'opinion'])->name('results.opinion');
 Route::get('/test-timezone', function(Request $request) {
     return response()->json([
         'detected' => $request->input('timezone', 'Not provided'),